@@ -10,16 +10,36 @@ from Clonify import LOGGER, app, userbot
 from Clonify.core.call import PRO
 from Clonify.misc import sudo
 from Clonify.plugins import ALL_MODULES
-from Clonify.utils.database import get_banned_users, get_gbanned
+from Clonify.utils.database import (
+    flush_served,
+    flush_settings,
+    get_banned_users,
+    get_gbanned,
+    load_flags,
+    load_served,
+    load_settings,
+)
+from Clonify.utils.database.indexes import ensure_indexes, explain_report
 from config import BANNED_USERS
 from Clonify.plugins.tools.clone import restart_bots
+from Clonify.utils import botapi, clonefleet, thumbnails, ytdlpool
+from Clonify.utils.stream import mediacache
 
 
 async def init():
-    if not config.STRING1:
+    if not config.STRING_SESSIONS:
         LOGGER(__name__).error("String Session not filled, please provide a valid session.")
         exit()
+    ytdlpool.start()
+    thumbnails.start()
     await sudo()
+    await ensure_indexes()
+    asyncio.create_task(explain_report())
+    await load_settings()
+    await load_flags()
+    await load_served()
+    mediacache.load()
+    asyncio.create_task(mediacache.flusher())
     try:
         users = await get_gbanned()
         for user_id in users:
@@ -30,6 +50,7 @@ async def init():
     except:
         pass
     await app.start()
+    asyncio.create_task(app.preload_images(config.LOGGER_ID))
     for all_module in ALL_MODULES:
         importlib.import_module("Clonify.plugins" + all_module)
     LOGGER("Clonify.plugins").info("𝐀𝐥𝐥 𝐅𝐞𝐚𝐭𝐮𝐫𝐞𝐬 𝐋𝐨𝐚𝐝𝐞𝐝 𝐁𝐚𝐛𝐲🥳...")
@@ -45,13 +66,19 @@ async def init():
     except:
         pass
     await PRO.decorators()
-    await restart_bots()
+    asyncio.create_task(restart_bots())
+    asyncio.create_task(clonefleet.supervise())
     LOGGER("Clonify").info(
         "╔═════ஜ۩۞۩ஜ════╗\n  ☠︎︎𝗠𝗔𝗗𝗘 𝗕𝗬 𝗣𝗿𝗼𝗕𝗼t𝘀☠︎︎\n╚═════ஜ۩۞۩ஜ════╝"
     )
     await idle()
+    await flush_settings()
+    await flush_served()
+    mediacache.flush()
     await app.stop()
     await userbot.stop()
+    ytdlpool.shutdown()
+    await botapi.close()
     LOGGER("Clonify").info("𝗦𝗧𝗢𝗣 𝗠𝗨𝗦𝗜𝗖🎻 𝗕𝗢𝗧..")
 
 
@@ -1,12 +1,13 @@
-from pyrogram import Client, errors
+from pyrogram import errors
 from pyrogram.enums import ChatMemberStatus, ParseMode
 
 import config
 
 from ..logging import LOGGER
+from .fileids import FileIdClient
 
 
-class PRO(Client):
+class PRO(FileIdClient):
     def __init__(self):
         LOGGER(__name__).info(f"Starting Bot...")
         super().__init__(
@@ -18,10 +18,12 @@ from pytgcalls.types.stream import StreamAudioEnded
 
 import config
 from Clonify import LOGGER, YouTube, app
+from Clonify.core.userbot import assistants
 from Clonify.misc import db
 from Clonify.utils.database import (
     add_active_chat,
     add_active_video_chat,
+    get_assistant_chats,
     get_lang,
     get_loop,
     group_assistant,
@@ -29,12 +31,21 @@ from Clonify.utils.database import (
     music_on,
     remove_active_chat,
     remove_active_video_chat,
+    set_calls_assistant,
     set_loop,
 )
 from Clonify.utils.exceptions import AssistantErr
 from Clonify.utils.formatters import check_duration, seconds_to_min, speed_converter
 from Clonify.utils.inline.play import stream_markup
 from Clonify.utils.stream.autoclear import auto_clean
+from Clonify.utils.stream.mediacache import follow_params, lookup
+from Clonify.utils.stream.prefetch import cancel_prefetch, prefetch
+from Clonify.utils.stream.position import (
+    get_played,
+    pause_position,
+    resume_position,
+    set_played,
+)
 from strings import get_string
 from Clonify.utils.thumbnails import get_thumb
 
@@ -43,6 +54,7 @@ counter = {}
 
 
 async def _clear_(chat_id):
+    cancel_prefetch(chat_id)
     db[chat_id] = []
     await remove_active_video_chat(chat_id)
     await remove_active_chat(chat_id)
@@ -50,24 +62,33 @@ async def _clear_(chat_id):
 
 class Call(PyTgCalls):
     def __init__(self):
-        self.userbot1 = Client(
-            name="RAUSHANAss1",
-            api_id=config.API_ID,
-            api_hash=config.API_HASH,
-            session_string=str(config.STRING1),
-        )
-        self.one = PyTgCalls(
-            self.userbot1,
-            cache_duration=150,
-        )
+        self.monitor_task = None
+        self.userbots = {}
+        self.calls = {}
+        for num, session in config.STRING_SESSIONS.items():
+            self.userbots[num] = Client(
+                name=f"RAUSHANAss{num}",
+                api_id=config.API_ID,
+                api_hash=config.API_HASH,
+                session_string=str(session),
+            )
+            self.calls[num] = PyTgCalls(
+                self.userbots[num],
+                cache_duration=150,
+            )
+        self.one = self.calls.get(1)
 
     async def pause_stream(self, chat_id: int):
         assistant = await group_assistant(self, chat_id)
         await assistant.pause_stream(chat_id)
+        if db.get(chat_id):
+            pause_position(db[chat_id][0])
 
     async def resume_stream(self, chat_id: int):
         assistant = await group_assistant(self, chat_id)
         await assistant.resume_stream(chat_id)
+        if db.get(chat_id):
+            resume_position(db[chat_id][0])
 
     async def stop_stream(self, chat_id: int):
         assistant = await group_assistant(self, chat_id)
@@ -78,11 +99,11 @@ class Call(PyTgCalls):
             pass
 
     async def stop_stream_force(self, chat_id: int):
-        try:
-            if config.STRING1:
-                await self.one.leave_group_call(chat_id)
-        except:
-            pass
+        for call in self.calls.values():
+            try:
+                await call.leave_group_call(chat_id)
+            except:
+                pass
         try:
             await _clear_(chat_id)
         except:
@@ -126,7 +147,7 @@ class Call(PyTgCalls):
             out = file_path
         dur = await asyncio.get_event_loop().run_in_executor(None, check_duration, out)
         dur = int(dur)
-        played, con_seconds = speed_converter(playing[0]["played"], speed)
+        played, con_seconds = speed_converter(get_played(playing[0]), speed)
         duration = seconds_to_min(dur)
         stream = (
             AudioVideoPiped(
@@ -151,7 +172,7 @@ class Call(PyTgCalls):
             if not exis:
                 db[chat_id][0]["old_dur"] = db[chat_id][0]["dur"]
                 db[chat_id][0]["old_second"] = db[chat_id][0]["seconds"]
-            db[chat_id][0]["played"] = con_seconds
+            set_played(db[chat_id][0], con_seconds)
             db[chat_id][0]["dur"] = duration
             db[chat_id][0]["seconds"] = dur
             db[chat_id][0]["speed_path"] = out
@@ -186,11 +207,17 @@ class Call(PyTgCalls):
                 video_parameters=MediumQualityVideo(),
             )
         else:
-            stream = AudioPiped(link, audio_parameters=HighQualityAudio())
+            stream = AudioPiped(
+                link,
+                audio_parameters=HighQualityAudio(),
+                additional_ffmpeg_parameters=follow_params(link),
+            )
         await assistant.change_stream(
             chat_id,
             stream,
         )
+        if db.get(chat_id):
+            set_played(db[chat_id][0])
 
     async def seek_stream(self, chat_id, file_path, to_seek, duration, mode):
         assistant = await group_assistant(self, chat_id)
@@ -245,7 +272,11 @@ class Call(PyTgCalls):
                     video_parameters=MediumQualityVideo(),
                 )
                 if video
-                else AudioPiped(link, audio_parameters=HighQualityAudio())
+                else AudioPiped(
+                    link,
+                    audio_parameters=HighQualityAudio(),
+                    additional_ffmpeg_parameters=follow_params(link),
+                )
             )
         try:
             await assistant.join_group_call(
@@ -290,6 +321,7 @@ class Call(PyTgCalls):
             except:
                 return
         else:
+            prefetch(chat_id)
             queued = check[0]["file"]
             language = await get_lang(chat_id)
             _ = get_string(language)
@@ -298,7 +330,6 @@ class Call(PyTgCalls):
             original_chat_id = check[0]["chat_id"]
             streamtype = check[0]["streamtype"]
             videoid = check[0]["vidid"]
-            db[chat_id][0]["played"] = 0
             exis = (check[0]).get("old_dur")
             if exis:
                 db[chat_id][0]["dur"] = exis
@@ -331,6 +362,7 @@ class Call(PyTgCalls):
                         original_chat_id,
                         text=_["call_6"],
                     )
+                set_played(check[0])
                 button = telegram_markup(_, chat_id)
                 run = await app.send_text(
                     chat_id=original_chat_id,
@@ -345,15 +377,10 @@ class Call(PyTgCalls):
                 db[chat_id][0]["mystic"] = run
                 db[chat_id][0]["markup"] = "tg"
             elif "vid_" in queued:
-                mystic = await app.send_message(original_chat_id, _["call_7"])
-                try:
-                    file_path, direct = await YouTube.download(
-                        videoid,
-                        mystic,
-                        videoid=True,
-                        video=True if str(streamtype) == "video" else False,
-                    )
-                except:
+                file_path = check[0].get("prefetched")
+                mystic = None
+                if not file_path:
+                    mystic = await app.send_message(original_chat_id, _["call_7"])
                     try:
                         file_path, direct = await YouTube.download(
                             videoid,
@@ -362,9 +389,19 @@ class Call(PyTgCalls):
                             video=True if str(streamtype) == "video" else False,
                         )
                     except:
-                        return await mystic.edit_text(
-                            _["call_6"], disable_web_page_preview=True
-                        )
+                        try:
+                            file_path, direct = await YouTube.download(
+                                videoid,
+                                mystic,
+                                videoid=True,
+                                video=True if str(streamtype) == "video" else False,
+                            )
+                        except:
+                            return await mystic.edit_text(
+                                _["call_6"], disable_web_page_preview=True
+                            )
+                    if direct:
+                        check[0]["prefetched"] = file_path
                 if video:
                     stream = AudioVideoPiped(
                         file_path,
@@ -375,6 +412,7 @@ class Call(PyTgCalls):
                     stream = AudioPiped(
                         file_path,
                         audio_parameters=HighQualityAudio(),
+                        additional_ffmpeg_parameters=follow_params(file_path),
                     )
                 try:
                     await client.change_stream(chat_id, stream)
@@ -383,9 +421,11 @@ class Call(PyTgCalls):
                         original_chat_id,
                         text=_["call_6"],
                     )
+                set_played(check[0])
                 img = await get_thumb(videoid)
                 button = stream_markup(_, chat_id)
-                await mystic.delete()
+                if mystic:
+                    await mystic.delete()
                 run = await app.send_text(
                     chat_id=original_chat_id,
                     text=_["stream_1"].format(
@@ -415,6 +455,7 @@ class Call(PyTgCalls):
                         original_chat_id,
                         text=_["call_6"],
                     )
+                set_played(check[0])
                 button = telegram_markup(_, chat_id)
                 run = await app.send_photo(
                     chat_id=original_chat_id,
@@ -443,6 +484,7 @@ class Call(PyTgCalls):
                         original_chat_id,
                         text=_["call_6"],
                     )
+                set_played(check[0])
                 if videoid == "telegram":
                     button = telegram_markup(_, chat_id)
                     run = await app.send_photo(
@@ -490,26 +532,163 @@ class Call(PyTgCalls):
 
     async def ping(self):
         pings = []
-        if config.STRING1:
-            pings.append(await self.one.ping)
+        for num in assistants:
+            try:
+                pings.append(await self.calls[num].ping)
+            except:
+                continue
+        if not pings:
+            return "0"
         return str(round(sum(pings) / len(pings), 3))
 
     async def start(self):
         LOGGER(__name__).info("Starting PyTgCalls Client...\n")
-        if config.STRING1:
-            await self.one.start()
+        for num, call in self.calls.items():
+            try:
+                await call.start()
+            except Exception as e:
+                LOGGER(__name__).error(
+                    f"PyTgCalls Client {num} failed to start : {type(e).__name__}"
+                )
+                if num in assistants:
+                    assistants.remove(num)
+        self.monitor_task = asyncio.create_task(self.monitor())
+        self.monitor_task.add_done_callback(self._monitor_done)
+
+    def _monitor_done(self, task):
+        if task.cancelled():
+            return
+        e = task.exception()
+        if e:
+            LOGGER(__name__).error(f"Assistant health monitor stopped : {e!r}")
+
+    async def is_alive(self, num: int) -> bool:
+        client = self.userbots[num]
+        if not client.is_connected:
+            return False
+        try:
+            await asyncio.wait_for(client.get_me(), timeout=15)
+        except Exception:
+            return False
+        return True
+
+    async def monitor(self):
+        dead = []
+        while not await asyncio.sleep(config.ASSISTANT_HEALTH_INTERVAL):
+            for num in list(self.calls):
+                try:
+                    alive = await self.is_alive(num)
+                except Exception:
+                    continue
+                if alive and num in dead:
+                    dead.remove(num)
+                    if num not in assistants:
+                        assistants.append(num)
+                    LOGGER(__name__).info(f"Assistant {num} is back in the pool.")
+                elif not alive and num not in dead:
+                    dead.append(num)
+                    if num in assistants:
+                        assistants.remove(num)
+                    LOGGER(__name__).warning(
+                        f"Assistant {num} is unreachable, moving its chats."
+                    )
+                    await self.failover(num)
+
+    async def failover(self, num: int):
+        # only calls in progress move now, the other chats of this assistant
+        # get a new one from group_assistant the next time they play
+        chats = await get_assistant_chats(num)
+        if not assistants:
+            LOGGER(__name__).error(
+                f"No assistant left to take over, ending {len(chats)} calls."
+            )
+            for chat_id in chats:
+                await _clear_(chat_id)
+            return
+        for chat_id in chats:
+            new = None
+            try:
+                new = await set_calls_assistant(chat_id)
+                await self.migrate_call(chat_id)
+                LOGGER(__name__).info(
+                    f"Moved call {chat_id} from assistant {num} to {new}."
+                )
+            except Exception as e:
+                LOGGER(__name__).error(
+                    f"Failed to move call {chat_id} to assistant {new} : {type(e).__name__}"
+                )
+                await _clear_(chat_id)
+
+    async def migrate_call(self, chat_id: int):
+        playing = db.get(chat_id)
+        if not playing:
+            return await _clear_(chat_id)
+        queued = playing[0]["file"]
+        videoid = playing[0]["vidid"]
+        video = str(playing[0]["streamtype"]) == "video"
+        if "live_" in queued:
+            n, link = await YouTube.video(videoid, True)
+            if n == 0:
+                raise AssistantErr(link)
+        elif "vid_" in queued:
+            link = playing[0].get("prefetched") or lookup(videoid, video)
+            if not link:
+                link, direct = await YouTube.download(
+                    videoid, None, videoid=True, video=video
+                )
+        elif "index_" in queued:
+            link = videoid
+        else:
+            link = playing[0].get("speed_path") or queued
+        extra = ""
+        played = get_played(playing[0])
+        if played and "live_" not in queued and "index_" not in queued:
+            extra = f"-ss {seconds_to_min(played)}"
+        extra = f"{follow_params(link)} {extra}".strip()
+        if video:
+            stream = AudioVideoPiped(
+                link,
+                audio_parameters=HighQualityAudio(),
+                video_parameters=MediumQualityVideo(),
+                additional_ffmpeg_parameters=extra,
+            )
+        else:
+            stream = AudioPiped(
+                link,
+                audio_parameters=HighQualityAudio(),
+                additional_ffmpeg_parameters=extra,
+            )
+        assistant = await group_assistant(self, chat_id)
+        await assistant.join_group_call(
+            chat_id,
+            stream,
+            stream_type=StreamType().pulse_stream,
+        )
 
     async def decorators(self):
-        @self.one.on_kicked()
-        @self.one.on_closed_voice_chat()
-        @self.one.on_left()
-        async def stream_services_handler(_, chat_id: int):
+        for call in self.calls.values():
+            self._register(call)
+
+    async def _assigned(self, client: PyTgCalls, chat_id: int) -> bool:
+        # an assistant that failed over still fires events for the chats it
+        # had, they belong to the one that took the call over now
+        return await group_assistant(self, chat_id) is client
+
+    def _register(self, call: PyTgCalls):
+        @call.on_kicked()
+        @call.on_closed_voice_chat()
+        @call.on_left()
+        async def stream_services_handler(client, chat_id: int):
+            if not await self._assigned(client, chat_id):
+                return
             await self.stop_stream(chat_id)
 
-        @self.one.on_stream_end()
+        @call.on_stream_end()
         async def stream_end_handler1(client, update: Update):
             if not isinstance(update, StreamAudioEnded):
                 return
+            if not await self._assigned(client, update.chat_id):
+                return
             await self.change_stream(client, update.chat_id)
 
 
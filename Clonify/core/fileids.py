@@ -0,0 +1,152 @@
+import asyncio
+import os
+
+from pyrogram import Client
+from pyrogram.errors import (
+    FileIdInvalid,
+    FileReferenceEmpty,
+    FileReferenceExpired,
+    MediaEmpty,
+    MediaInvalid,
+)
+from pyrogram.types import InputMediaPhoto
+
+import config
+
+from ..logging import LOGGER
+from .mongo import mongodb
+
+fileidsdb = mongodb.fileids
+
+# errors that mean the cached file_id itself is unusable, anything else (a bad
+# caption, a wrong chat, an unchanged message) has nothing to do with it
+FILE_ID_ERRORS = (
+    FileIdInvalid,
+    FileReferenceEmpty,
+    FileReferenceExpired,
+    MediaEmpty,
+    MediaInvalid,
+)
+
+# bot id -> {url or local file -> telegram file_id}, file_ids only work for the
+# bot that uploaded them so every bot keeps its own namespace
+file_ids = {}
+
+
+def static_images() -> list:
+    """The images configured in config.py, the only ones worth a file_id."""
+    images = list(config.STREAMI_PICS)
+    for name in dir(config):
+        value = getattr(config, name)
+        if name.endswith("_URL") and isinstance(value, str):
+            images.append(value)
+    return list(dict.fromkeys(images))
+
+
+_static = None
+
+
+def media_key(photo):
+    # per-video cards are sent once or twice each, caching them would only
+    # grow the collection without end
+    global _static
+    if _static is None:
+        _static = set(static_images())
+    if not isinstance(photo, str) or photo not in _static:
+        return None
+    if photo.startswith(("http://", "https://")):
+        return photo
+    if os.path.isfile(photo):
+        stat = os.stat(photo)
+        return f"{os.path.realpath(photo)}:{int(stat.st_mtime)}:{stat.st_size}"
+    return None
+
+
+class FileIdClient(Client):
+    """Client that sends cached file_ids for photos it has uploaded before."""
+
+    async def refresh_me(self):
+        # self.me is loaded once by start(), handlers read it instead of asking
+        # telegram every time, this is for when the profile was changed
+        self.me = await self.get_me()
+        return self.me
+
+    async def _file_ids(self) -> dict:
+        ids = file_ids.get(self.me.id)
+        if ids is None:
+            ids = file_ids[self.me.id] = {}
+            keys = [key for key in map(media_key, static_images()) if key]
+            # drops what older versions cached for thumbnail cards and images
+            # that are no longer configured
+            await fileidsdb.delete_many({"bot": self.me.id, "key": {"$nin": keys}})
+            async for item in fileidsdb.find({"bot": self.me.id}):
+                ids[item["key"]] = item["file_id"]
+        return ids
+
+    async def _remember(self, key, message):
+        if not key or not message or not message.photo:
+            return
+        ids = await self._file_ids()
+        if ids.get(key) == message.photo.file_id:
+            return
+        ids[key] = message.photo.file_id
+        await fileidsdb.update_one(
+            {"bot": self.me.id, "key": key},
+            {"$set": {"file_id": message.photo.file_id}},
+            upsert=True,
+        )
+
+    async def _forget(self, key):
+        (await self._file_ids()).pop(key, None)
+        await fileidsdb.delete_one({"bot": self.me.id, "key": key})
+
+    async def send_photo(self, chat_id, photo, *args, **kwargs):
+        key = media_key(photo)
+        if key:
+            file_id = (await self._file_ids()).get(key)
+            if file_id:
+                try:
+                    return await super().send_photo(chat_id, file_id, *args, **kwargs)
+                except FILE_ID_ERRORS:
+                    await self._forget(key)
+        message = await super().send_photo(chat_id, photo, *args, **kwargs)
+        await self._remember(key, message)
+        return message
+
+    async def edit_message_media(self, chat_id, message_id, media, *args, **kwargs):
+        if not isinstance(media, InputMediaPhoto):
+            return await super().edit_message_media(
+                chat_id, message_id, media, *args, **kwargs
+            )
+        key = media_key(media.media)
+        source = media.media
+        if key:
+            file_id = (await self._file_ids()).get(key)
+            if file_id:
+                media.media = file_id
+                try:
+                    return await super().edit_message_media(
+                        chat_id, message_id, media, *args, **kwargs
+                    )
+                except FILE_ID_ERRORS:
+                    await self._forget(key)
+                finally:
+                    media.media = source
+        message = await super().edit_message_media(
+            chat_id, message_id, media, *args, **kwargs
+        )
+        await self._remember(key, message)
+        return message
+
+    async def preload_images(self, chat_id):
+        """Upload every configured image once so later sends only pass a file_id."""
+        ids = await self._file_ids()
+        for url in static_images():
+            if not media_key(url) or media_key(url) in ids:
+                continue
+            try:
+                message = await self.send_photo(chat_id, url)
+                await message.delete()
+            except Exception as e:
+                LOGGER(__name__).warning(f"Could not pre-upload {url} : {type(e).__name__}")
+            await asyncio.sleep(1)
@@ -10,42 +10,53 @@ assistantids = []
 
 class Userbot(Client):
     def __init__(self):
-        self.one = Client(
-            name="PROAss1",
-            api_id=config.API_ID,
-            api_hash=config.API_HASH,
-            session_string=str(config.STRING1),
-            no_updates=True,
-        )
+        self.clients = {}
+        for num, session in config.STRING_SESSIONS.items():
+            self.clients[num] = Client(
+                name=f"PROAss{num}",
+                api_id=config.API_ID,
+                api_hash=config.API_HASH,
+                session_string=str(session),
+                no_updates=True,
+            )
+        self.one = self.clients.get(1)
 
     async def start(self):
         LOGGER(__name__).info(f"Starting Assistants...")
-        if config.STRING1:
-            await self.one.start()
+        for num, client in self.clients.items():
             try:
-                await self.one.join_chat("PURVI_SUPPORT")
-                await self.one.join_chat("PURVI_UPDATES")
+                await client.start()
+            except Exception as e:
+                LOGGER(__name__).error(
+                    f"Assistant Account {num} failed to start : {type(e).__name__}"
+                )
+                continue
+            try:
+                await client.join_chat("PURVI_SUPPORT")
+                await client.join_chat("PURVI_UPDATES")
             except:
                 pass
-            assistants.append(1)
             try:
-                await self.one.send_message(config.LOGGER_ID, "Assistant Started")
+                await client.send_message(config.LOGGER_ID, "Assistant Started")
             except:
                 LOGGER(__name__).error(
-                    "Assistant Account 1 has failed to access the log Group. Make sure that you have added your assistant to your log group and promoted as admin!"
+                    f"Assistant Account {num} has failed to access the log Group. Make sure that you have added your assistant to your log group and promoted as admin!"
                 )
-                exit()
-            self.one.id = self.one.me.id
-            self.one.name = self.one.me.mention
-            self.one.username = self.one.me.username
-            assistantids.append(self.one.id)
-            LOGGER(__name__).info(f"Assistant Started as {self.one.name}")
-
+                continue
+            client.id = client.me.id
+            client.name = client.me.mention
+            client.username = client.me.username
+            assistants.append(num)
+            assistantids.append(client.id)
+            LOGGER(__name__).info(f"Assistant {num} Started as {client.name}")
+        if not assistants:
+            LOGGER(__name__).error("No assistant account could be started.")
+            exit()
 
     async def stop(self):
         LOGGER(__name__).info(f"Stopping Assistants...")
-        try:
-            if config.STRING1:
-                await self.one.stop()
-        except:
-            pass
+        for client in self.clients.values():
+            try:
+                await client.stop()
+            except:
+                pass
@@ -0,0 +1,8 @@
+from pyrogram import Client
+
+from Clonify.utils.clonefleet import touch
+
+
+@Client.on_raw_update(group=-1)
+async def clone_activity(client, update, users, chats):
+    touch(client.me.id)
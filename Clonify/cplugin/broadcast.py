@@ -8,8 +8,8 @@ from Clonify import app
 from Clonify.misc import SUDOERS
 from Clonify.utils.database import (
     get_client,
-    get_served_chats_clone,
-    get_served_users_clone,
+    iter_served_chats_clone,
+    iter_served_users_clone,
 )
 from Clonify.utils.decorators.language import language
 from Clonify.utils.formatters import alpha_to_int
@@ -146,11 +146,11 @@ IS_BROADCASTING = False
 async def broadcast_message(client, message, _):
 
     # Get bot ID
-    bot = await client.get_me()
+    bot = client.me
     bot_id = bot.id
 
     # get owner info
-    C_OWNER = get_owner_id_from_db(bot_id)
+    C_OWNER = await get_owner_id_from_db(bot_id)
     OWNERS = [OWNER_ID, C_OWNER]
 
     if message.from_user.id not in OWNERS:
@@ -159,8 +159,8 @@ async def broadcast_message(client, message, _):
     global IS_BROADCASTING
 
     # Check if bot has premium
-    a = await client.get_me()
-    premium_status = check_bot_premium(a.id)
+    a = client.me
+    premium_status = await check_bot_premium(a.id)
     if premium_status is None:
         return await message.reply_text("Bot ID not found!")
     elif not premium_status:
@@ -197,10 +197,8 @@ async def broadcast_message(client, message, _):
     # Broadcast to chats
     if "-nobot" not in message.text:
         sent, pin = 0, 0
-        served_chats = await get_served_chats_clone(bot_id)
-        for chat in served_chats:
+        async for chat_id in iter_served_chats_clone(bot_id):
             try:
-                chat_id = int(chat["chat_id"])
                 m = (
                     await client.forward_messages(chat_id, y, x)
                     if message.reply_to_message
@@ -236,10 +234,8 @@ async def broadcast_message(client, message, _):
     # Broadcast to users
     if "-user" in message.text:
         susr = 0
-        served_users = await get_served_users_clone(bot_id)
-        for user in served_users:
+        async for user_id in iter_served_users_clone(bot_id):
             try:
-                user_id = int(user["user_id"])
                 m = (
                     await client.forward_messages(user_id, y, x)
                     if message.reply_to_message
@@ -8,6 +8,7 @@ from pyrogram.errors import (
     UserNotParticipant,
 )
 import config
+from Clonify.utils.admincache import get_admins
 from Clonify.utils.database import get_assistant
 from pyrogram import filters, Client
 from pyrogram.types import InlineKeyboardButton, InlineKeyboardMarkup, CallbackQuery
@@ -53,6 +54,8 @@ from Clonify.utils.inline import (
     panel_markup_1,
 )
 from Clonify.utils.stream.autoclear import auto_clean
+from Clonify.utils.stream.prefetch import restart_prefetch
+from Clonify.utils.stream.position import get_played, set_played
 from Clonify.utils.thumbnails import get_thumb
 from config import (
     BANNED_USERS,
@@ -60,7 +63,6 @@ from config import (
     STREAM_IMG_URL,
     TELEGRAM_AUDIO_URL,
     TELEGRAM_VIDEO_URL,
-    adminlist,
     confirmer,
     votemode,
 )
@@ -68,7 +70,6 @@ from strings import get_string
 from config import lyrical
 from Clonify.utils.database.clonedb import get_owner_id_from_db, get_cloned_support_chat, get_cloned_support_channel
 
-wrong = {}
 
 
 # =============================FUNCTIONS==============================#
@@ -159,7 +160,7 @@ async def del_back_playlist(client, CallbackQuery, _):
                 _,
                 playing[0]["vidid"],
                 chat_id,
-                seconds_to_min(playing[0]["played"]),
+                seconds_to_min(get_played(playing[0])),
                 playing[0]["dur"],
             )
     try:
@@ -188,7 +189,6 @@ async def unban_assistant(_, callback: CallbackQuery):
         )
 
 
-checker = {}
 upvoters = {}
 
 
@@ -196,9 +196,9 @@ upvoters = {}
 @languageCB
 async def del_back_playlist(client, CallbackQuery, _):
 
-    bot = await client.get_me()
+    bot = client.me
 
-    C_BOT_OWNER_ID = get_owner_id_from_db(bot.id)
+    C_BOT_OWNER_ID = await get_owner_id_from_db(bot.id)
 
     #Cloned Bot Support Chat and channel
     C_BOT_SUPPORT_CHAT = await get_cloned_support_chat(bot.id)
@@ -206,7 +206,7 @@ async def del_back_playlist(client, CallbackQuery, _):
     C_BOT_SUPPORT_CHANNEL = await get_cloned_support_channel(bot.id)
     C_SUPPORT_CHANNEL = f"https://t.me/{C_BOT_SUPPORT_CHANNEL}"
 
-    cusername = (await client.get_me()).username
+    cusername = client.me.username
     callback_data = CallbackQuery.data.strip()
     callback_request = callback_data.split(None, 1)[1]
     command, chat = callback_request.split("|")
@@ -288,7 +288,7 @@ async def del_back_playlist(client, CallbackQuery, _):
         is_non_admin = await is_nonadmin_chat(CallbackQuery.message.chat.id)
         if not is_non_admin:
             if CallbackQuery.from_user.id not in SUDOERS:
-                admins = adminlist.get(CallbackQuery.message.chat.id)
+                admins = await get_admins(client, CallbackQuery.message.chat.id)
                 if not admins:
                     return await CallbackQuery.answer(_["admin_13"], show_alert=True)
                 else:
@@ -383,6 +383,7 @@ async def del_back_playlist(client, CallbackQuery, _):
         await CallbackQuery.answer()
         random.shuffle(check)
         check.insert(0, popped)
+        restart_prefetch(chat_id)
         await CallbackQuery.message.reply_text(_["admin_44"].format(mention))
     elif command == "Skip" or command == "Replay":
         check = db.get(chat_id)
@@ -424,6 +425,7 @@ async def del_back_playlist(client, CallbackQuery, _):
         else:
             txt = f"➻ sᴛʀᴇᴀᴍ ʀᴇ-ᴘʟᴀʏᴇᴅ 🎄\n│ \n└ʙʏ : {mention} 🥀"
         await CallbackQuery.answer()
+        restart_prefetch(chat_id)
         queued = check[0]["file"]
         title = (check[0]["title"]).title()
         user = check[0]["by"]
@@ -431,7 +433,6 @@ async def del_back_playlist(client, CallbackQuery, _):
         streamtype = check[0]["streamtype"]
         videoid = check[0]["vidid"]
         status = True if str(streamtype) == "video" else None
-        db[chat_id][0]["played"] = 0
         exis = (check[0]).get("old_dur")
         if exis:
             db[chat_id][0]["dur"] = exis
@@ -469,18 +470,23 @@ async def del_back_playlist(client, CallbackQuery, _):
             db[chat_id][0]["markup"] = "tg"
             await CallbackQuery.edit_message_text(txt, reply_markup=close_markup(_))
         elif "vid_" in queued:
-            mystic = await CallbackQuery.message.reply_text(
-                _["call_7"], disable_web_page_preview=True
-            )
-            try:
-                file_path, direct = await YouTube.download(
-                    videoid,
-                    mystic,
-                    videoid=True,
-                    video=status,
+            mystic = None
+            file_path = check[0].get("prefetched")
+            if not file_path:
+                mystic = await CallbackQuery.message.reply_text(
+                    _["call_7"], disable_web_page_preview=True
                 )
-            except:
-                return await mystic.edit_text(_["call_6"])
+                try:
+                    file_path, direct = await YouTube.download(
+                        videoid,
+                        mystic,
+                        videoid=True,
+                        video=status,
+                    )
+                except:
+                    return await mystic.edit_text(_["call_6"])
+                if direct:
+                    check[0]["prefetched"] = file_path
             try:
                 image = await YouTube.thumbnail(videoid, True)
             except:
@@ -488,7 +494,9 @@ async def del_back_playlist(client, CallbackQuery, _):
             try:
                 await PRO.skip_stream(chat_id, file_path, video=status, image=image)
             except:
-                return await mystic.edit_text(_["call_6"])
+                if mystic:
+                    await mystic.delete()
+                return await CallbackQuery.message.reply_text(_["call_6"])
             button = stream_markup(_, chat_id)
             img = await get_thumb(videoid)
             run = await CallbackQuery.message.reply_photo(
@@ -504,7 +512,8 @@ async def del_back_playlist(client, CallbackQuery, _):
             db[chat_id][0]["mystic"] = run
             db[chat_id][0]["markup"] = "stream"
             await CallbackQuery.edit_message_text(txt, reply_markup=close_markup(_))
-            await mystic.delete()
+            if mystic:
+                await mystic.delete()
         elif "index_" in queued:
             try:
                 await PRO.skip_stream(chat_id, videoid, video=status)
@@ -590,7 +599,7 @@ async def del_back_playlist(client, CallbackQuery, _):
         file_path = playing[0]["file"]
         if "index_" in file_path or "live_" in file_path:
             return await CallbackQuery.answer(_["admin_22"], show_alert=True)
-        duration_played = int(playing[0]["played"])
+        duration_played = get_played(playing[0])
         if int(command) in [1, 2]:
             duration_to_skip = 10
         else:
@@ -628,98 +637,6 @@ async def del_back_playlist(client, CallbackQuery, _):
             )
         except:
             return await mystic.edit_text(_["admin_26"])
-        if int(command) in [1, 3]:
-            db[chat_id][0]["played"] -= duration_to_skip
-        else:
-            db[chat_id][0]["played"] += duration_to_skip
+        set_played(db[chat_id][0], to_seek)
         string = _["admin_25"].format(seconds_to_min(to_seek))
         await mystic.edit_text(f"{string}\n\nᴄʜᴀɴɢᴇs ᴅᴏɴᴇ ʙʏ : {mention} !")
-
-# Zeo
-async def markup_timer():
-    while not await asyncio.sleep(300):
-        active_chats = await get_active_chats()
-        for chat_id in active_chats:
-            try:
-                if not await is_music_playing(chat_id):
-                    continue
-                playing = db.get(chat_id)
-                if not playing:
-                    continue
-                duration_seconds = int(playing[0]["seconds"])
-                if duration_seconds == 0:
-                    continue
-                try:
-                    mystic = playing[0]["markup"]
-                except:
-                    continue
-                try:
-                    check = checker[chat_id][mystic.id]
-                    if check is False:
-                        continue
-                except:
-                    pass
-                try:
-                    language = await get_lang(chat_id)
-                    _ = get_string(language)
-                except:
-                    _ = get_string("en")
-                try:
-                    mystic = playing[0]["mystic"]
-                    markup = playing[0]["markup"]
-                except:
-                    continue
-                try:
-                    check = wrong[chat_id][mystic.id]
-                    if check is False:
-                        continue
-                except:
-                    pass
-                try:
-                    language = await get_lang(chat_id)
-                    _ = get_string(language)
-                except:
-                    _ = get_string("en")
-                try:
-                    mystic = playing[0]["mystic"]
-                    markup = playing[0]["markup"]
-                except:
-                    continue
-                try:
-                    check = wrong[chat_id][mystic.id]
-                    if check is False:
-                        continue
-                except:
-                    pass
-                try:
-                    language = await get_lang(chat_id)
-                    _ = get_string(language)
-                except:
-                    _ = get_string("en")
-                try:
-                    buttons = (
-                        stream_markup_timer(
-                            _,
-                            playing[0]["vidid"],
-                            chat_id,
-                            seconds_to_min(playing[0]["played"]),
-                            playing[0]["dur"],
-                        )
-                        if markup == "stream"
-                        else stream_markup_timer2(
-                            _,
-                            chat_id,
-                            seconds_to_min(playing[0]["played"]),
-                            playing[0]["dur"],
-                        )
-                    )
-                    await mystic.edit_reply_markup(
-                        reply_markup=InlineKeyboardMarkup(buttons)
-                    )
-                except:
-                    continue
-            except:
-                continue
-
-
-asyncio.create_task(markup_timer())
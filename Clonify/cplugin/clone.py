@@ -18,7 +18,7 @@ APP_LINK = f"https://t.me/MayaMusicRobot"
 @Client.on_message(filters.command("clone"))
 @language
 async def ping_clone(client: Client, message: Message, _):
-    bot = await client.get_me()
+    bot = client.me
 
 
     hmm = await message.reply_photo(
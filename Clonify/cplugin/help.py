@@ -30,9 +30,9 @@ async def helper_private(
     client: app, update: Union[types.Message, types.CallbackQuery]
 ):
     
-    bot = await client.get_me()
+    bot = client.me
 
-    C_BOT_OWNER_ID = get_owner_id_from_db(bot.id)
+    C_BOT_OWNER_ID = await get_owner_id_from_db(bot.id)
 
     #Cloned Bot Support Chat and channel
     C_BOT_SUPPORT_CHAT = await get_cloned_support_chat(bot.id)
@@ -13,9 +13,9 @@ from Clonify.utils.database.clonedb import get_owner_id_from_db, get_cloned_supp
 
 @Client.on_message(filters.command("ping"))
 async def ping_clone(client: Client, message: Message):
-    bot = await client.get_me()
+    bot = client.me
 
-    C_BOT_OWNER_ID = get_owner_id_from_db(bot.id)
+    C_BOT_OWNER_ID = await get_owner_id_from_db(bot.id)
 
     #Cloned Bot Support Chat and channel
     C_BOT_SUPPORT_CHAT = await get_cloned_support_chat(bot.id)
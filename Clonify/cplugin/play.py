@@ -74,16 +74,16 @@ async def play_commnd(
     url,
     fplay,
 ):
-    cuser = await client.get_me()
+    cuser = client.me
     bot_id = cuser.id
     user_id = message.from_user.id
 
-    C_BOT_OWNER_ID = get_owner_id_from_db(bot_id)
+    C_BOT_OWNER_ID = await get_owner_id_from_db(bot_id)
 
     bot_mention = cuser.mention
 
-    C_LOG_STATUS = get_logging_status(bot_id)
-    C_LOGGER_ID = get_log_channel(bot_id)
+    C_LOG_STATUS = await get_logging_status(bot_id)
+    C_LOGGER_ID = await get_log_channel(bot_id)
 
     if str(C_LOGGER_ID) == "-100":
         C_LOGGER_ID = C_BOT_OWNER_ID
@@ -233,8 +233,7 @@ async def play_commnd(
                     )
                 except Exception as e:
                     print(e)
-
-                    os.system(f"kill -9 {os.getpid()} && bash start")
+                    return await mystic.edit_text(_["play_3"])
                 streamtype = "playlist"
                 plist_type = "yt"
                 if "&" in url:
@@ -275,16 +274,14 @@ async def play_commnd(
                     )
                 except Exception as e:
                     print(e)  # Handle or log the error appropriately
-
-                    os.system(f"kill -9 {os.getpid()} && bash start")
+                    return await mystic.edit_text(_["play_3"])
 
             else:
                 try:
                     details, track_id = await YouTube.track(url)
                 except Exception as e:
                     print(e)
-
-                    os.system(f"kill -9 {os.getpid()} && bash start")
+                    return await mystic.edit_text(_["play_3"])
                 streamtype = "youtube"
                 img = details["thumb"]
                 cap = _["play_11"].format(
@@ -301,8 +298,7 @@ async def play_commnd(
                 try:
                     details, track_id = await Spotify.track(url)
                 except:
-
-                    os.system(f"kill -9 {os.getpid()} && bash start")
+                    return await mystic.edit_text(_["play_3"])
                 streamtype = "youtube"
                 img = details["thumb"]
                 cap = _["play_10"].format(details["title"], details["duration_min"])
@@ -310,8 +306,7 @@ async def play_commnd(
                 try:
                     details, plist_id = await Spotify.playlist(url)
                 except Exception:
-
-                    os.system(f"kill -9 {os.getpid()} && bash start")
+                    return await mystic.edit_text(_["play_3"])
                 streamtype = "playlist"
                 plist_type = "spplay"
                 img = config.SPOTIFY_PLAYLIST_IMG_URL
@@ -320,8 +315,7 @@ async def play_commnd(
                 try:
                     details, plist_id = await Spotify.album(url)
                 except:
-
-                    os.system(f"kill -9 {os.getpid()} && bash start")
+                    return await mystic.edit_text(_["play_3"])
                 streamtype = "playlist"
                 plist_type = "spalbum"
                 img = config.SPOTIFY_ALBUM_IMG_URL
@@ -330,8 +324,7 @@ async def play_commnd(
                 try:
                     details, plist_id = await Spotify.artist(url)
                 except:
-
-                    os.system(f"kill -9 {os.getpid()} && bash start")
+                    return await mystic.edit_text(_["play_3"])
                 streamtype = "playlist"
                 plist_type = "spartist"
                 img = config.SPOTIFY_ARTIST_IMG_URL
@@ -343,8 +336,7 @@ async def play_commnd(
                 try:
                     details, track_id = await Apple.track(url)
                 except:
-
-                    os.system(f"kill -9 {os.getpid()} && bash start")
+                    return await mystic.edit_text(_["play_3"])
                 streamtype = "youtube"
                 img = details["thumb"]
                 cap = _["play_10"].format(details["title"], details["duration_min"])
@@ -353,21 +345,18 @@ async def play_commnd(
                 try:
                     details, plist_id = await Apple.playlist(url)
                 except:
-
-                    os.system(f"kill -9 {os.getpid()} && bash start")
+                    return await mystic.edit_text(_["play_3"])
                 streamtype = "playlist"
                 plist_type = "apple"
                 cap = _["play_12"].format(cuser.mention, message.from_user.mention)
                 img = url
             else:
-
-                os.system(f"kill -9 {os.getpid()} && bash start")
+                return await mystic.edit_text(_["play_3"])
         elif await Resso.valid(url):
             try:
                 details, track_id = await Resso.track(url)
             except:
-
-                os.system(f"kill -9 {os.getpid()} && bash start")
+                return await mystic.edit_text(_["play_3"])
             streamtype = "youtube"
             img = details["thumb"]
             cap = _["play_10"].format(details["title"], details["duration_min"])
@@ -375,8 +364,7 @@ async def play_commnd(
             try:
                 details, track_path = await SoundCloud.download(url)
             except:
-
-                os.system(f"kill -9 {os.getpid()} && bash start")
+                return await mystic.edit_text(_["play_3"])
             duration_sec = details["duration_sec"]
             if duration_sec > config.DURATION_LIMIT:
                 return await mystic.edit_text(
@@ -465,8 +453,7 @@ async def play_commnd(
         try:
             details, track_id = await YouTube.track(query)
         except:
-
-            os.system(f"kill -9 {os.getpid()} && bash start")
+            return await mystic.edit_text(_["play_3"])
         streamtype = "youtube"
     if str(playmode) == "Direct":
         if not plist_type:
@@ -594,7 +581,7 @@ async def play_commnd(
 @Client.on_callback_query(filters.regex("MusicStream") & ~BANNED_USERS)
 @languageCB
 async def play_music(client: Client, CallbackQuery, _):
-    cuser = await client.get_me()
+    cuser = client.me
     callback_data = CallbackQuery.data.strip()
     callback_request = callback_data.split(None, 1)[1]
     vidid, user_id, mode, cplay, fplay = callback_request.split("|")
@@ -619,8 +606,7 @@ async def play_music(client: Client, CallbackQuery, _):
     try:
         details, track_id = await YouTube.track(vidid, True)
     except:
-
-        os.system(f"kill -9 {os.getpid()} && bash start")
+        return await mystic.edit_text(_["play_3"])
     if details["duration_min"]:
         duration_sec = time_to_seconds(details["duration_min"])
         if duration_sec > config.DURATION_LIMIT:
@@ -720,32 +706,27 @@ async def play_playlists_command(client: Client, CallbackQuery, _):
                 True,
             )
         except:
-
-            os.system(f"kill -9 {os.getpid()} && bash start")
+            return await mystic.edit_text(_["play_3"])
     if ptype == "spplay":
         try:
             result, spotify_id = await Spotify.playlist(videoid)
         except:
-
-            os.system(f"kill -9 {os.getpid()} && bash start")
+            return await mystic.edit_text(_["play_3"])
     if ptype == "spalbum":
         try:
             result, spotify_id = await Spotify.album(videoid)
         except:
-
-            os.system(f"kill -9 {os.getpid()} && bash start")
+            return await mystic.edit_text(_["play_3"])
     if ptype == "spartist":
         try:
             result, spotify_id = await Spotify.artist(videoid)
         except:
-
-            os.system(f"kill -9 {os.getpid()} && bash start")
+            return await mystic.edit_text(_["play_3"])
     if ptype == "apple":
         try:
             result, apple_id = await Apple.playlist(videoid, True)
         except:
-
-            os.system(f"kill -9 {os.getpid()} && bash start")
+            return await mystic.edit_text(_["play_3"])
     try:
         await stream(
             client,
@@ -832,8 +813,10 @@ from Clonify.utils.inline import (
     panel_markup_4,
 )
 from Clonify.utils.pastebin import PROBin
+from Clonify.utils.stream.position import set_played
 from Clonify.utils.stream.queue import put_queue, put_queue_index
-from youtubesearchpython.__future__ import VideosSearch
+from Clonify.utils.stream.playlist import PlaylistProgress, resolve_playlist
+from Clonify.utils.ytmeta import search_one
 from Clonify.utils.database.clonedb import get_owner_id_from_db, get_cloned_support_chat, get_cloned_support_channel
 
 
@@ -852,8 +835,8 @@ async def stream(
     forceplay: Union[bool, str] = None,
 ):
     
-    a = await client.get_me()
-    C_BOT_OWNER_ID = get_owner_id_from_db(a.id)
+    a = client.me
+    C_BOT_OWNER_ID = await get_owner_id_from_db(a.id)
 
     #Cloned Bot Support Chat and channel
     C_BOT_SUPPORT_CHAT = await get_cloned_support_chat(a.id)
@@ -868,19 +851,16 @@ async def stream(
     if streamtype == "playlist":
         msg = f"{_['play_19']}\n\n"
         count = 0
-        for search in result:
+        resolved = 0
+        progress = PlaylistProgress(_, mystic, len(result))
+        async for details in resolve_playlist(result, False if spotify else True):
             if int(count) == config.PLAYLIST_FETCH_LIMIT:
+                break
+            resolved += 1
+            await progress.update(resolved, count)
+            if not details:
                 continue
-            try:
-                (
-                    title,
-                    duration_min,
-                    duration_sec,
-                    thumbnail,
-                    vidid,
-                ) = await YouTube.details(search, False if spotify else True)
-            except:
-                continue
+            title, duration_min, duration_sec, thumbnail, vidid = details
             if str(duration_min) == "None":
                 continue
             if duration_sec > config.DURATION_LIMIT:
@@ -896,6 +876,7 @@ async def stream(
                     vidid,
                     user_id,
                     "video" if video else "audio",
+                    bot_id=client.me.id,
                 )
                 position = len(db.get(chat_id)) - 1
                 count += 1
@@ -910,8 +891,7 @@ async def stream(
                         vidid, mystic, video=status, videoid=True
                     )
                 except:
-
-                    os.system(f"kill -9 {os.getpid()} && bash start")
+                    raise AssistantErr(_["play_14"])
                 await PRO.join_call(
                     chat_id,
                     original_chat_id,
@@ -930,9 +910,12 @@ async def stream(
                     user_id,
                     "video" if video else "audio",
                     forceplay=forceplay,
+                    bot_id=client.me.id,
                 )
+                # joined above, playback starts now
+                set_played(db[chat_id][0])
                 img = await get_thumb(vidid)
-                i = await client.get_me()
+                i = client.me
                 button = panel_markup_clone(_, vidid, chat_id)
                 run = await client.send_photo(
                     original_chat_id,
@@ -977,8 +960,7 @@ async def stream(
                 vidid, mystic, videoid=True, video=status
             )
         except:
-
-            os.system(f"kill -9 {os.getpid()} && bash start")
+            raise AssistantErr(_["play_14"])
         if await is_active_chat(chat_id):
             await put_queue(
                 chat_id,
@@ -990,6 +972,7 @@ async def stream(
                 vidid,
                 user_id,
                 "video" if video else "audio",
+                bot_id=client.me.id,
             )
             img = await get_thumb(vidid)
             position = len(db.get(chat_id)) - 1
@@ -1020,9 +1003,11 @@ async def stream(
                 user_id,
                 "video" if video else "audio",
                 forceplay=forceplay,
+                bot_id=client.me.id,
             )
+            set_played(db[chat_id][0])
             img = await get_thumb(vidid)
-            i = await client.get_me()
+            i = client.me
             button = panel_markup_clone(_, vidid, chat_id)
             run = await client.send_photo(
                 original_chat_id,
@@ -1053,6 +1038,7 @@ async def stream(
                 streamtype,
                 user_id,
                 "audio",
+                bot_id=client.me.id,
             )
             position = len(db.get(chat_id)) - 1
             button = aq_markup(_, chat_id)
@@ -1076,7 +1062,9 @@ async def stream(
                 user_id,
                 "audio",
                 forceplay=forceplay,
+                bot_id=client.me.id,
             )
+            set_played(db[chat_id][0])
             button = stream_markup2(_, chat_id)
             run = await client.send_photo(
                 original_chat_id,
@@ -1105,6 +1093,7 @@ async def stream(
                 streamtype,
                 user_id,
                 "video" if video else "audio",
+                bot_id=client.me.id,
             )
             position = len(db.get(chat_id)) - 1
             button = aq_markup(_, chat_id)
@@ -1128,7 +1117,9 @@ async def stream(
                 user_id,
                 "video" if video else "audio",
                 forceplay=forceplay,
+                bot_id=client.me.id,
             )
+            set_played(db[chat_id][0])
             if video:
                 await add_active_video_chat(chat_id)
             button = stream_markup2(_, chat_id)
@@ -1158,6 +1149,7 @@ async def stream(
                 vidid,
                 user_id,
                 "video" if video else "audio",
+                bot_id=client.me.id,
             )
             position = len(db.get(chat_id)) - 1
             button = aq_markup(_, chat_id)
@@ -1190,9 +1182,11 @@ async def stream(
                 user_id,
                 "video" if video else "audio",
                 forceplay=forceplay,
+                bot_id=client.me.id,
             )
+            set_played(db[chat_id][0])
             img = await get_thumb(vidid)
-            i = await client.get_me()
+            i = client.me
             button = stream_markup2(_, chat_id)
             run = await client.send_photo(
                 original_chat_id,
@@ -1221,6 +1215,7 @@ async def stream(
                 user_name,
                 link,
                 "video" if video else "audio",
+                bot_id=client.me.id,
             )
             position = len(db.get(chat_id)) - 1
             button = aq_markup(_, chat_id)
@@ -1245,7 +1240,9 @@ async def stream(
                 link,
                 "video" if video else "audio",
                 forceplay=forceplay,
+                bot_id=client.me.id,
             )
+            set_played(db[chat_id][0])
             button = stream_markup2(_, chat_id)
             run = await client.send_photo(
                 original_chat_id,
@@ -1262,8 +1259,8 @@ async def get_thumb(videoid):
     try:
         # Search for the video using video ID
         query = f"https://www.youtube.com/watch?v={videoid}"
-        results = VideosSearch(query, limit=1)
-        for result in (await results.next())["result"]:
+        result = await search_one(query)
+        if result:
             thumbnail = result["thumbnails"][0]["url"].split("?")[0]
         return thumbnail
     except Exception as e:
@@ -6,30 +6,28 @@ from Clonify import app
 from Clonify.misc import SUDOERS
 from Clonify.utils.decorators.language import language
 
-from Clonify.utils.database.clonedb import get_owner_id_from_db, get_cloned_support_chat, get_cloned_support_channel, check_bot_premium
+from Clonify.utils.database.clonedb import get_owner_id_from_db, get_cloned_support_chat, get_cloned_support_channel, check_bot_premium, get_clone, update_clone
 from config import SUPPORT_CHAT, OWNER_ID
 
-from Clonify.utils.database import clonebotdb
-
 
 #set clone bot support channel
 @Client.on_message(filters.command("setchannel"))
 @language
 async def set_channel(client: Client, message: Message, _):
 
-    bot = await client.get_me()
+    bot = client.me
     bot_id = bot.id
 
     # premium check --------------
     # get owner info
-    C_OWNER = get_owner_id_from_db(bot_id)
+    C_OWNER = await get_owner_id_from_db(bot_id)
     OWNERS = [OWNER_ID, C_OWNER]
 
     if message.from_user.id not in OWNERS:
         return await message.reply_text(_["NOT_C_OWNER"].format(SUPPORT_CHAT))
     
     # Check if bot has premium
-    premium_status = check_bot_premium(bot_id)
+    premium_status = await check_bot_premium(bot_id)
     if premium_status is None:
         return await message.reply_text(_["C_B_P_1"])
     elif not premium_status:
@@ -48,7 +46,7 @@ async def set_channel(client: Client, message: Message, _):
     if channel.startswith("@"):
         channel = channel[1:] 
 
-    result = clonebotdb.update_one({"bot_id": bot_id}, {"$set": {"channel": channel}})
+    result = await update_clone(bot_id, {"channel": channel})
     if result.modified_count > 0:
         await message.reply_text(_["C_P_I_4"].format(channel))
     else:
@@ -60,19 +58,19 @@ async def set_channel(client: Client, message: Message, _):
 @language
 async def set_support(client: Client, message: Message, _):
 
-    bot = await client.get_me()
+    bot = client.me
     bot_id = bot.id
 
     # premium check --------------
     # get owner info
-    C_OWNER = get_owner_id_from_db(bot_id)
+    C_OWNER = await get_owner_id_from_db(bot_id)
     OWNERS = [OWNER_ID, C_OWNER]
 
     if message.from_user.id not in OWNERS:
         return await message.reply_text(_["NOT_C_OWNER"].format(SUPPORT_CHAT))
     
     # Check if bot has premium
-    premium_status = check_bot_premium(bot_id)
+    premium_status = await check_bot_premium(bot_id)
     if premium_status is None:
         return await message.reply_text(_["C_B_P_1"])
     elif not premium_status:
@@ -91,7 +89,7 @@ async def set_support(client: Client, message: Message, _):
     if support.startswith("@"):
         support = support[1:] 
 
-    result = clonebotdb.update_one({"bot_id": bot_id}, {"$set": {"support": support}})
+    result = await update_clone(bot_id, {"support": support})
     if result.modified_count > 0:
         await message.reply_text(_["C_P_I_3"].format(support))
     else:
@@ -104,12 +102,12 @@ async def set_support(client: Client, message: Message, _):
 @language
 async def bot_info(client: Client, message: Message, _):
 
-    bot = await client.get_me()
+    bot = client.me
     bot_id = bot.id
 
     # premium check --------------
     # get owner info
-    C_OWNER = get_owner_id_from_db(bot_id)
+    C_OWNER = await get_owner_id_from_db(bot_id)
     OWNERS = [OWNER_ID, C_OWNER]
 
     if message.from_user.id not in OWNERS:
@@ -119,7 +117,7 @@ async def bot_info(client: Client, message: Message, _):
 
     channel = await get_cloned_support_channel(bot_id)
     support = await get_cloned_support_chat(bot_id)
-    premium_status = check_bot_premium(bot_id)
+    premium_status = await check_bot_premium(bot_id)
     if premium_status == True:
         bot_status = "Premium"
     else:
@@ -135,12 +133,12 @@ async def bot_info(client: Client, message: Message, _):
     )
 
 
-def get_logging_status(bot_id):
-    bot_data = clonebotdb.find_one({"bot_id": bot_id})
+async def get_logging_status(bot_id):
+    bot_data = await get_clone(bot_id) or {}
     return bot_data.get("logging", True)
 
-def get_log_channel(bot_id):
-    bot_data = clonebotdb.find_one({"bot_id": bot_id})
+async def get_log_channel(bot_id):
+    bot_data = await get_clone(bot_id) or {}
     return bot_data.get("logchannel", "-100")
 
 
@@ -149,14 +147,14 @@ def get_log_channel(bot_id):
 async def check_log_status(client, message, _):
     bot_id = client.me.id
 
-    C_OWNER = get_owner_id_from_db(bot_id)
+    C_OWNER = await get_owner_id_from_db(bot_id)
     OWNERS = [OWNER_ID, C_OWNER]
 
     if message.from_user.id not in OWNERS:
         return await message.reply_text(_["NOT_C_OWNER"].format(SUPPORT_CHAT))
 
-    logging_status = get_logging_status(bot_id)
-    log_channel = get_log_channel(bot_id)
+    logging_status = await get_logging_status(bot_id)
+    log_channel = await get_log_channel(bot_id)
 
     if logging_status:
         C_LOGGER_STATUS = "Enabled"
@@ -180,10 +178,10 @@ async def check_log_status(client, message, _):
 @Client.on_message(filters.command("logger"))
 @language
 async def toggle_logging(client: Client, message: Message, _):
-    bot = await client.get_me()
+    bot = client.me
     bot_id = bot.id
 
-    C_OWNER = get_owner_id_from_db(bot_id)
+    C_OWNER = await get_owner_id_from_db(bot_id)
     OWNERS = [OWNER_ID, C_OWNER]
 
     if message.from_user.id not in OWNERS:
@@ -198,11 +196,7 @@ async def toggle_logging(client: Client, message: Message, _):
 
     logging_status = option == "enable"
 
-    result = clonebotdb.update_one(
-        {"bot_id": bot_id}, 
-        {"$set": {"logging": logging_status}}, 
-        upsert=True
-    )
+    result = await update_clone(bot_id, {"logging": logging_status}, upsert=True)
 
     if result.modified_count > 0 or result.upserted_id:
         await message.reply_text(f"{'ᴇɴᴀʙʟᴇᴅ ʟᴏɢɢɪɴɢ.' if logging_status else 'ᴅɪsᴀʙʟᴇᴅ ʟᴏɢɢɪɴɢ.'}")
@@ -214,10 +208,10 @@ async def toggle_logging(client: Client, message: Message, _):
 @Client.on_message(filters.command("setlogger"))
 @language
 async def set_log_channel(client: Client, message: Message, _):
-    bot = await client.get_me()
+    bot = client.me
     bot_id = bot.id
 
-    C_OWNER = get_owner_id_from_db(bot_id)
+    C_OWNER = await get_owner_id_from_db(bot_id)
     OWNERS = [OWNER_ID, C_OWNER]
 
     if message.from_user.id not in OWNERS:
@@ -237,11 +231,7 @@ async def set_log_channel(client: Client, message: Message, _):
     try:
         test_msg = await client.send_message(group_id, "ʙᴏᴛ ʟᴏɢɢɪɴɢ ᴇɴᴀʙʟᴇᴅ sᴜᴄᴄᴇssғᴜʟʟʏ!")
         
-        result = clonebotdb.update_one(
-            {"bot_id": bot_id}, 
-            {"$set": {"logchannel": group_id}}, 
-            upsert=True
-        )
+        result = await update_clone(bot_id, {"logchannel": group_id}, upsert=True)
 
         if result.modified_count > 0 or result.upserted_id:
             return await message.reply_text(f"ʟᴏɢɢɪɴɢ ᴇɴᴀʙʟᴇᴅ ғᴏʀ `{group_id}`.")
@@ -9,6 +9,7 @@ from Clonify.utils.database import get_loop
 from Clonify.utils.decorators import AdminRightsCheck
 from Clonify.utils.inline import close_markup, stream_markup, stream_markup2
 from Clonify.utils.stream.autoclear import auto_clean
+from Clonify.utils.stream.prefetch import restart_prefetch
 from Clonify.utils.thumbnails import get_thumb
 from config import BANNED_USERS
 from Clonify.utils.database.clonedb import get_owner_id_from_db, get_cloned_support_chat, get_cloned_support_channel
@@ -24,8 +25,8 @@ from Clonify.utils.database.clonedb import get_owner_id_from_db, get_cloned_supp
 @AdminRightsCheck
 async def skip(cli, message: Message, _, chat_id):
 
-    a = await cli.get_me()
-    C_BOT_OWNER_ID = get_owner_id_from_db(a.id)
+    a = cli.me
+    C_BOT_OWNER_ID = await get_owner_id_from_db(a.id)
 
     C_BOT_SUPPORT_CHAT = await get_cloned_support_chat(a.id)
     C_SUPPORT_CHAT = f"https://t.me/{C_BOT_SUPPORT_CHAT}"
@@ -103,13 +104,13 @@ async def skip(cli, message: Message, _, chat_id):
                 return await PRO.stop_stream(chat_id)
             except:
                 return
+    restart_prefetch(chat_id)
     queued = check[0]["file"]
     title = (check[0]["title"]).title()
     user = check[0]["by"]
     streamtype = check[0]["streamtype"]
     videoid = check[0]["vidid"]
     status = True if str(streamtype) == "video" else None
-    db[chat_id][0]["played"] = 0
     exis = (check[0]).get("old_dur")
     if exis:
         db[chat_id][0]["dur"] = exis
@@ -143,16 +144,21 @@ async def skip(cli, message: Message, _, chat_id):
         db[chat_id][0]["mystic"] = run
         db[chat_id][0]["markup"] = "tg"
     elif "vid_" in queued:
-        mystic = await message.reply_text(_["call_7"], disable_web_page_preview=True)
-        try:
-            file_path, direct = await YouTube.download(
-                videoid,
-                mystic,
-                videoid=True,
-                video=status,
-            )
-        except:
-            return await mystic.edit_text(_["call_6"])
+        mystic = None
+        file_path = check[0].get("prefetched")
+        if not file_path:
+            mystic = await message.reply_text(_["call_7"], disable_web_page_preview=True)
+            try:
+                file_path, direct = await YouTube.download(
+                    videoid,
+                    mystic,
+                    videoid=True,
+                    video=status,
+                )
+            except:
+                return await mystic.edit_text(_["call_6"])
+            if direct:
+                check[0]["prefetched"] = file_path
         try:
             image = await YouTube.thumbnail(videoid, True)
         except:
@@ -160,7 +166,9 @@ async def skip(cli, message: Message, _, chat_id):
         try:
             await PRO.skip_stream(chat_id, file_path, video=status, image=image)
         except:
-            return await mystic.edit_text(_["call_6"])
+            if mystic:
+                await mystic.delete()
+            return await message.reply_text(_["call_6"])
         button = stream_markup(_, chat_id)
         img = await get_thumb(videoid)
         run = await message.reply_photo(
@@ -175,7 +183,8 @@ async def skip(cli, message: Message, _, chat_id):
         )
         db[chat_id][0]["mystic"] = run
         db[chat_id][0]["markup"] = "stream"
-        await mystic.delete()
+        if mystic:
+            await mystic.delete()
     elif "index_" in queued:
         try:
             await PRO.skip_stream(chat_id, videoid, video=status)
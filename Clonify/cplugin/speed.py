@@ -5,10 +5,11 @@ from Clonify import app
 from Clonify.core.call import PRO
 from Clonify.misc import SUDOERS, db
 from Clonify.utils import AdminRightsCheck
+from Clonify.utils.admincache import get_admins
 from Clonify.utils.database import is_active_chat, is_nonadmin_chat
 from Clonify.utils.decorators.language import languageCB
 from Clonify.utils.inline import close_markup, speed_markup
-from config import BANNED_USERS, adminlist
+from config import BANNED_USERS
 
 checker = []
 
@@ -20,7 +21,7 @@ checker = []
 )
 @AdminRightsCheck
 async def playback(client, message: Message, _, chat_id):
-    cname = (await client.get_me()).mention
+    cname = client.me.mention
     playing = db.get(chat_id)
     if not playing:
         return await client.send_message(message.chat.id, text=_["queue_2"])
@@ -50,7 +51,7 @@ async def del_back_playlist(client, callback_query, _):
     is_non_admin = await is_nonadmin_chat(callback_query.message.chat.id)
     if not is_non_admin:
         if callback_query.from_user.id not in SUDOERS:
-            admins = adminlist.get(callback_query.message.chat.id)
+            admins = await get_admins(client, callback_query.message.chat.id)
             if not admins:
                 return await callback_query.answer(_["admin_13"], show_alert=True)
             else:
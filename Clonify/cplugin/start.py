@@ -4,7 +4,7 @@ import asyncio
 from pyrogram import filters, Client
 from pyrogram.enums import ChatType
 from pyrogram.types import InlineKeyboardButton, InlineKeyboardMarkup, Message
-from youtubesearchpython.__future__ import VideosSearch
+from Clonify.utils.ytmeta import search_one
 from Clonify import app
 
 from pyrogram.types import InlineKeyboardButton, InlineKeyboardMarkup, InputMediaPhoto
@@ -38,13 +38,13 @@ from Clonify.cplugin.setinfo import get_logging_status, get_log_channel
 @Client.on_message(filters.command(["start"]) & filters.private & ~BANNED_USERS)
 @LanguageStart
 async def start_pm(client, message: Message, _):
-    a = await client.get_me()
+    a = client.me
     # await add_served_user_clone(message.from_user.id)
     bot_id = a.id
     await add_served_user_clone(message.from_user.id, bot_id)
 
     loading_1 = await message.reply_text("⚡")
-    C_BOT_OWNER_ID = get_owner_id_from_db(a.id)
+    C_BOT_OWNER_ID = await get_owner_id_from_db(a.id)
     # await asyncio.sleep(0.2)
     
     await loading_1.edit_text("<b>ʟᴏᴀᴅɪɴɢ</b>")
@@ -82,8 +82,8 @@ async def start_pm(client, message: Message, _):
             m = await message.reply_text("🔎")
             query = (str(name)).replace("info_", "", 1)
             query = f"https://www.youtube.com/watch?v={query}"
-            results = VideosSearch(query, limit=1)
-            for result in (await results.next())["result"]:
+            result = await search_one(query)
+            if result:
                 title = result["title"]
                 duration = result["duration"]
                 views = result["viewCount"]["short"]
@@ -138,8 +138,8 @@ async def start_pm(client, message: Message, _):
             reply_markup=InlineKeyboardMarkup(out),
         )
 
-        C_LOG_STATUS = get_logging_status(bot_id)  # Logging check
-        C_LOGGER_ID = get_log_channel(bot_id)  # Get log channel ID
+        C_LOG_STATUS = await get_logging_status(bot_id)  # Logging check
+        C_LOGGER_ID = await get_log_channel(bot_id)  # Get log channel ID
 
         if C_LOG_STATUS:  # Agar logging enabled hai
             if str(C_LOGGER_ID) == "-100":  # Agar log channel set nahi hai
@@ -159,7 +159,7 @@ async def start_pm(client, message: Message, _):
 @Client.on_message(filters.command(["start"]) & filters.group & ~BANNED_USERS)
 @LanguageStart
 async def start_gp(client, message: Message, _):
-    a = await client.get_me()
+    a = client.me
     #Cloned Bot Support Chat and channel
     C_BOT_SUPPORT_CHAT = await get_cloned_support_chat(a.id)
     C_SUPPORT_CHAT = f"https://t.me/{C_BOT_SUPPORT_CHAT}"
@@ -14,8 +14,8 @@ from Clonify.core.userbot import assistants
 from Clonify.misc import SUDOERS, mongodb
 from Clonify.plugins import ALL_MODULES
 from Clonify.utils.database import (
-    get_served_chats_clone,
-    get_served_users_clone,
+    count_served_chats_clone,
+    count_served_users_clone,
     get_sudoers,
 )
 from Clonify.utils.decorators.language import language, languageCB
@@ -26,7 +26,7 @@ from config import BANNED_USERS
 @Client.on_message(filters.command(["stats", "gstats"]) & ~BANNED_USERS)
 @language
 async def stats_global(client: Client, message: Message, _):
-    a = await client.get_me()
+    a = client.me
     bot_id = a.id
 
     upl = stats_buttons(_, True if message.from_user.id in SUDOERS else False)
@@ -40,7 +40,7 @@ async def stats_global(client: Client, message: Message, _):
 @Client.on_callback_query(filters.regex("stats_back") & ~BANNED_USERS)
 @languageCB
 async def home_stats(client, CallbackQuery, _):
-    a = await client.get_me()
+    a = client.me
     bot_id = a.id
     upl = stats_buttons(_, True if CallbackQuery.from_user.id in SUDOERS else False)
     await CallbackQuery.edit_message_text(
@@ -52,7 +52,7 @@ async def home_stats(client, CallbackQuery, _):
 @Client.on_callback_query(filters.regex("TopOverall") & ~BANNED_USERS)
 @languageCB
 async def overall_stats(client, CallbackQuery, _):
-    a = await client.get_me()
+    a = client.me
     bot_id = a.id
     await CallbackQuery.answer()
     upl = back_stats_buttons(_)
@@ -61,8 +61,8 @@ async def overall_stats(client, CallbackQuery, _):
     except:
         pass
     await CallbackQuery.edit_message_text(_["gstats_1"].format(a.mention))
-    served_chats = len(await get_served_chats_clone(bot_id))
-    served_users = len(await get_served_users_clone(bot_id))
+    served_chats = await count_served_chats_clone(bot_id)
+    served_users = await count_served_users_clone(bot_id)
     text = _["gstats_3"].format(
         a.mention,
         len(assistants),
@@ -86,7 +86,7 @@ async def overall_stats(client, CallbackQuery, _):
 @Client.on_callback_query(filters.regex("bot_stats_sudo"))
 @languageCB
 async def bot_stats(client, CallbackQuery, _):
-    a = await client.get_me()
+    a = client.me
     bot_id = a.id
     if CallbackQuery.from_user.id not in SUDOERS:
         return await CallbackQuery.answer(_["gstats_4"], show_alert=True)
@@ -114,8 +114,8 @@ async def bot_stats(client, CallbackQuery, _):
     call = await mongodb.command("dbstats")
     datasize = call["dataSize"] / 1024
     storage = call["storageSize"] / 1024
-    served_chats = len(await get_served_chats_clone(bot_id))
-    served_users = len(await get_served_users_clone(bot_id))
+    served_chats = await count_served_chats_clone(bot_id)
+    served_users = await count_served_users_clone(bot_id)
     text = _["gstats_5"].format(
         a.mention,
         len(ALL_MODULES),
@@ -3,7 +3,7 @@ from typing import Union
 
 import aiohttp
 from bs4 import BeautifulSoup
-from youtubesearchpython.__future__ import VideosSearch
+from Clonify.utils.ytmeta import search_one
 
 
 class RessoAPI:
@@ -37,8 +37,8 @@ class RessoAPI:
                     pass
         if des == "":
             return
-        results = VideosSearch(title, limit=1)
-        for result in (await results.next())["result"]:
+        result = await search_one(title)
+        if result:
             title = result["title"]
             ytlink = result["link"]
             vidid = result["id"]
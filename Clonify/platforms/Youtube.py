@@ -5,7 +5,9 @@ import os
 import re
 import json
 import glob
+from collections import deque
 import random
+import time
 import logging
 from urllib.parse import urlencode, urljoin
 from typing import Union, Optional, Tuple
@@ -14,14 +16,18 @@ import aiohttp
 import yt_dlp
 from pyrogram.enums import MessageEntityType
 from pyrogram.types import Message
-from youtubesearchpython.__future__ import VideosSearch
 
 # If you want to use AudioPiped/AudioFile in your bot, import these where you call join_call:
 # from pytgcalls.types.input_stream import AudioPiped, AudioFile
 
+import config
+
 # Replace with actual function or import from your project
 from Clonify.utils.database import is_on_off
 from Clonify.utils.formatters import time_to_seconds
+from Clonify.utils import ytdlpool
+from Clonify.utils.stream import mediacache
+from Clonify.utils.ytmeta import VIDEO_ID, search_one
 
 # Constants - Updated for JioSaavn API
 BASE_URL = "https://apikeyy-zeta.vercel.app/api"
@@ -350,20 +356,11 @@ async def get_audio_stream_from_jiosaavn_api_v2(
 # --------------------
 async def check_file_size(link: str) -> Optional[int]:
     async def get_format_info(link_):
-        proc = await asyncio.create_subprocess_exec(
-            "yt-dlp",
-            "--cookies",
-            cookie_txt_file(),
-            "-J",
-            link_,
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE,
-        )
-        stdout, stderr = await proc.communicate()
-        if proc.returncode != 0:
-            print(f"Error:\n{stderr.decode()}")
+        try:
+            return await ytdlpool.extract(link_)
+        except Exception as e:
+            print(f"Error:\n{e}")
             return None
-        return json.loads(stdout.decode())
 
     def parse_size(formats):
         total_size = 0
@@ -397,6 +394,128 @@ async def shell_cmd(cmd: str) -> str:
             return err.decode("utf-8")
     return out.decode("utf-8")
 
+# --------------------
+# Single-flight for downloads
+# --------------------
+# (link, kind, format_id, title) -> in-flight download future, shared by every
+# concurrent caller and dropped once it settles so failures are never cached
+inflight_downloads = {}
+
+
+def _download_settled(key, future):
+    inflight_downloads.pop(key, None)
+    if not future.cancelled():
+        future.exception()
+
+# --------------------
+# Stream URL cache
+# --------------------
+# googlevideo urls carry their own expiry, so a resolved url is reused until
+# shortly before it runs out and refreshed in the background ahead of that
+EXPIRE = re.compile(r"expire[=/](\d+)")
+# (link, format) -> (url, expires_at)
+stream_urls = {}
+# (link, format) -> in-flight resolution future
+resolving = {}
+stream_url_stats = {"hits": 0, "misses": 0, "refreshes": 0}
+
+
+def _url_expiry(url: str) -> Optional[int]:
+    match = EXPIRE.search(url)
+    if match:
+        return int(match.group(1))
+
+
+async def _resolve_stream_url(link: str, fmt: str) -> Tuple[int, str]:
+    try:
+        url = await ytdlpool.get_url(link, fmt)
+    except Exception as e:
+        return 0, str(e)
+    expires = _url_expiry(url)
+    now = time.time()
+    for key in [k for k, (_, exp) in stream_urls.items() if exp <= now]:
+        stream_urls.pop(key, None)
+    if expires:
+        stream_urls[(link, fmt)] = (url, expires)
+    return 1, url
+
+
+def _resolution_settled(key, future):
+    resolving.pop(key, None)
+    if not future.cancelled():
+        future.exception()
+
+
+def _resolve(link: str, fmt: str):
+    key = (link, fmt)
+    future = resolving.get(key)
+    if future is None:
+        future = asyncio.ensure_future(_resolve_stream_url(link, fmt))
+        resolving[key] = future
+        future.add_done_callback(lambda f: _resolution_settled(key, f))
+    return future
+
+
+async def get_stream_url(link: str, fmt: str) -> Tuple[int, str]:
+    cached = stream_urls.get((link, fmt))
+    if cached:
+        url, expires = cached
+        left = expires - time.time()
+        if left > config.STREAM_URL_MARGIN:
+            stream_url_stats["hits"] += 1
+            if left < config.STREAM_URL_REFRESH and (link, fmt) not in resolving:
+                stream_url_stats["refreshes"] += 1
+                _resolve(link, fmt)
+            return 1, url
+        stream_urls.pop((link, fmt), None)
+    stream_url_stats["misses"] += 1
+    return await asyncio.shield(_resolve(link, fmt))
+
+# --------------------
+# Streaming audio downloads
+# --------------------
+# seconds until the audio source was playable, for downloads that were
+# streamed while still being written and for ones that had to finish first
+first_audio = {"streamed": deque(maxlen=100), "full": deque(maxlen=100)}
+
+
+def _stream_settled(path, job):
+    mediacache.settle(path)
+    if job.cancelled() or job.exception():
+        # the call may still be reading it, it goes once the queue moves on
+        mediacache.discard(path)
+        return
+    mediacache.touch(path, False)
+
+
+async def stream_audio(link: str, vidid: str, opts: dict) -> str:
+    """Start downloading and hand back the file once its first bytes are on disk."""
+    prefix = os.path.join(mediacache.DOWNLOADS, f"{vidid}.")
+    for path, job in mediacache.growing.items():
+        if path.startswith(prefix) and not job.done():
+            return path
+    mediacache.sweep()
+    start = time.monotonic()
+    # no whole-download timeout, a long track may be playing from this file
+    # for longer than that, ffmpeg gives up on it by itself if it stalls
+    job = asyncio.ensure_future(
+        ytdlpool.download(link, dict(opts, nopart=True), timeout=None)
+    )
+    pattern = os.path.join("downloads", f"{glob.escape(vidid)}.*")
+    while not job.done():
+        for file in glob.glob(pattern):
+            path = os.path.realpath(file)
+            if path in mediacache.index or os.path.getsize(path) < config.STREAM_START_BYTES:
+                continue
+            mediacache.grow(path, job)
+            job.add_done_callback(lambda f: _stream_settled(path, f))
+            first_audio["streamed"].append(time.monotonic() - start)
+            return path
+        await asyncio.sleep(0.2)
+    path = await job
+    first_audio["full"].append(time.monotonic() - start)
+    return path
+
 # --------------------
 # YouTubeAPI Class
 # --------------------
@@ -443,8 +562,8 @@ class YouTubeAPI:
             link = self.base + link
         if "&" in link:
             link = link.split("&")[0]
-        results = VideosSearch(link, limit=1)
-        for result in (await results.next())["result"]:
+        result = await search_one(link)
+        if result:
             title = result["title"]
             duration_min = result["duration"]
             thumbnail = result["thumbnails"][0]["url"].split("?")[0]
@@ -460,8 +579,8 @@ class YouTubeAPI:
             link = self.base + link
         if "&" in link:
             link = link.split("&")[0]
-        results = VideosSearch(link, limit=1)
-        for result in (await results.next())["result"]:
+        result = await search_one(link)
+        if result:
             return result["title"]
 
     async def duration(self, link: str, videoid: Union[bool, str] = None) -> Optional[str]:
@@ -469,8 +588,8 @@ class YouTubeAPI:
             link = self.base + link
         if "&" in link:
             link = link.split("&")[0]
-        results = VideosSearch(link, limit=1)
-        for result in (await results.next())["result"]:
+        result = await search_one(link)
+        if result:
             return result["duration"]
 
     async def thumbnail(self, link: str, videoid: Union[bool, str] = None) -> Optional[str]:
@@ -478,8 +597,8 @@ class YouTubeAPI:
             link = self.base + link
         if "&" in link:
             link = link.split("&")[0]
-        results = VideosSearch(link, limit=1)
-        for result in (await results.next())["result"]:
+        result = await search_one(link)
+        if result:
             return result["thumbnails"][0]["url"].split("?")[0]
 
     async def video(self, link: str, videoid: Union[bool, str] = None) -> Tuple[int, str]:
@@ -487,34 +606,15 @@ class YouTubeAPI:
             link = self.base + link
         if "&" in link:
             link = link.split("&")[0]
-        proc = await asyncio.create_subprocess_exec(
-            "yt-dlp",
-            "--cookies",
-            cookie_txt_file(),
-            "-g",
-            "-f",
-            "best[height<=?720][width<=?1280]",
-            link,
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE,
-        )
-        stdout, stderr = await proc.communicate()
-        if stdout:
-            return 1, stdout.decode().split("\n")[0]
-        else:
-            return 0, stderr.decode()
+        return await get_stream_url(link, "best[height<=?720][width<=?1280]")
 
     async def playlist(self, link, limit, user_id, videoid: Union[bool, str] = None) -> list:
         if videoid:
             link = self.listbase + link
         if "&" in link:
             link = link.split("&")[0]
-        playlist = await shell_cmd(
-            f"yt-dlp -i --get-id --flat-playlist --cookies {cookie_txt_file()} --playlist-end {limit} --skip-download {link}"
-        )
         try:
-            result = playlist.split("\n")
-            result = [x for x in result if x != ""]
+            result = await ytdlpool.flat_playlist(link, limit)
         except Exception:
             result = []
         return result
@@ -524,8 +624,8 @@ class YouTubeAPI:
             link = self.base + link
         if "&" in link:
             link = link.split("&")[0]
-        results = VideosSearch(link, limit=1)
-        for result in (await results.next())["result"]:
+        result = await search_one(link)
+        if result:
             title = result["title"]
             duration_min = result["duration"]
             vidid = result["id"]
@@ -545,11 +645,9 @@ class YouTubeAPI:
             link = self.base + link
         if "&" in link:
             link = link.split("&")[0]
-        ytdl_opts = {"quiet": True, "cookiefile": cookie_txt_file()}
-        ydl = yt_dlp.YoutubeDL(ytdl_opts)
-        with ydl:
-            formats_available = []
-            r = ydl.extract_info(link, download=False)
+        formats_available = []
+        r = await ytdlpool.extract(link)
+        if r:
             for f in r["formats"]:
                 try:
                     str(f["format"])
@@ -587,19 +685,61 @@ class YouTubeAPI:
         Returns (source, direct)
           - If direct is False, source is a network URL (use AudioPiped with PyTgCalls)
           - If direct is True, source is a local file path (use AudioFile with PyTgCalls)
+
+        Concurrent calls for the same media share one resolution and download.
         """
         if videoid:
             link = self.base + link
+        if not songaudio and not songvideo:
+            match = VIDEO_ID.search(link)
+            cached = match and mediacache.lookup(match.group(1), video)
+            if cached:
+                return cached, True
+        if songvideo:
+            kind = "songvideo"
+        elif songaudio:
+            kind = "songaudio"
+        else:
+            kind = "video" if video else "audio"
+        key = (link, kind, format_id, title if songaudio or songvideo else None)
+        future = inflight_downloads.get(key)
+        if future is None:
+            future = asyncio.ensure_future(
+                self._download(
+                    link,
+                    video=video,
+                    songaudio=songaudio,
+                    songvideo=songvideo,
+                    format_id=format_id,
+                    title=title,
+                )
+            )
+            inflight_downloads[key] = future
+            future.add_done_callback(lambda f: _download_settled(key, f))
+        # shield so a cancelled caller does not abort the download for the others
+        source, direct = await asyncio.shield(future)
+        if direct and not songaudio and not songvideo:
+            mediacache.touch(source, video)
+        return source, direct
+
+    async def _download(
+        self,
+        link: str,
+        video: Union[bool, str] = None,
+        songaudio: Union[bool, str] = None,
+        songvideo: Union[bool, str] = None,
+        format_id: Union[bool, str] = None,
+        title: Union[bool, str] = None,
+    ) -> Tuple[Optional[str], Optional[bool]]:
 
         # Prefer JioSaavn API for audio if not video or song video
         if not video and not songvideo:
             try:
                 search_title = title
                 if not search_title:
-                    results = VideosSearch(link, limit=1)
-                    for result in (await results.next())["result"]:
+                    result = await search_one(link)
+                    if result:
                         search_title = result["title"]
-                        break
 
                 if search_title:
                     logging.info(f"Searching JioSaavn API for: {search_title}")
@@ -623,111 +763,59 @@ class YouTubeAPI:
             except Exception as e:
                 logging.error(f"JioSaavn API error, falling back to yt-dlp: {str(e)}")
 
-        loop = asyncio.get_running_loop()
-
-        def audio_dl():
-            ydl_opts = {
-                "format": "bestaudio/best",
-                "outtmpl": "downloads/%(id)s.%(ext)s",
-                "geo_bypass": True,
-                "nocheckcertificate": True,
-                "quiet": True,
-                "cookiefile": cookie_txt_file(),
-                "no_warnings": True,
-            }
-            ydl = yt_dlp.YoutubeDL(ydl_opts)
-            info = ydl.extract_info(link, False)
-            filepath = os.path.join("downloads", f"{info['id']}.{info['ext']}")
-            if os.path.exists(filepath):
-                return filepath
-            ydl.download([link])
-            return filepath
-
-        def video_dl():
-            ydl_opts = {
-                "format": "(bestvideo[height<=?720][width<=?1280][ext=mp4])+(bestaudio[ext=m4a])",
-                "outtmpl": "downloads/%(id)s.%(ext)s",
-                "geo_bypass": True,
-                "nocheckcertificate": True,
-                "quiet": True,
-                "cookiefile": cookie_txt_file(),
-                "no_warnings": True,
-            }
-            ydl = yt_dlp.YoutubeDL(ydl_opts)
-            info = ydl.extract_info(link, False)
-            filepath = os.path.join("downloads", f"{info['id']}.{info['ext']}")
-            if os.path.exists(filepath):
-                return filepath
-            ydl.download([link])
-            return filepath
-
-        def song_video_dl():
-            formats = f"{format_id}+140"
-            fpath = f"downloads/{title}"
-            ydl_opts = {
-                "format": formats,
-                "outtmpl": fpath,
-                "geo_bypass": True,
-                "nocheckcertificate": True,
-                "quiet": True,
-                "no_warnings": True,
-                "cookiefile": cookie_txt_file(),
-                "prefer_ffmpeg": True,
-                "merge_output_format": "mp4",
-            }
-            ydl = yt_dlp.YoutubeDL(ydl_opts)
-            ydl.download([link])
-
-        def song_audio_dl():
-            formats = "bestaudio/best"
-            fpath = f"downloads/{title}.mp3"
-            ydl_opts = {
-                "format": formats,
-                "outtmpl": fpath,
-                "geo_bypass": True,
-                "nocheckcertificate": True,
-                "quiet": True,
-                "no_warnings": True,
-                "cookiefile": cookie_txt_file(),
-                "postprocessors": [
-                    {
-                        "key": "FFmpegExtractAudio",
-                        "preferredcodec": "mp3",
-                        "preferredquality": "192",
-                    }
-                ],
-            }
-            ydl = yt_dlp.YoutubeDL(ydl_opts)
-            ydl.download([link])
+        audio_opts = {
+            "format": "bestaudio/best",
+            "outtmpl": "downloads/%(id)s.%(ext)s",
+            "geo_bypass": True,
+            "nocheckcertificate": True,
+        }
+        video_opts = {
+            "format": "(bestvideo[height<=?720][width<=?1280][ext=mp4])+(bestaudio[ext=m4a])",
+            "outtmpl": "downloads/%(id)s.%(ext)s",
+            "geo_bypass": True,
+            "nocheckcertificate": True,
+        }
+        song_video_opts = {
+            "format": f"{format_id}+140",
+            "outtmpl": f"downloads/{title}",
+            "geo_bypass": True,
+            "nocheckcertificate": True,
+            "prefer_ffmpeg": True,
+            "merge_output_format": "mp4",
+        }
+        song_audio_opts = {
+            "format": "bestaudio/best",
+            "outtmpl": f"downloads/{title}.mp3",
+            "geo_bypass": True,
+            "nocheckcertificate": True,
+            "postprocessors": [
+                {
+                    "key": "FFmpegExtractAudio",
+                    "preferredcodec": "mp3",
+                    "preferredquality": "192",
+                }
+            ],
+        }
 
         if songvideo:
-            await loop.run_in_executor(None, song_video_dl)
+            await ytdlpool.download(link, song_video_opts, reuse=False)
             fpath = f"downloads/{title}.mp4"
             return fpath, True
         elif songaudio:
-            await loop.run_in_executor(None, song_audio_dl)
+            await ytdlpool.download(link, song_audio_opts, reuse=False)
             fpath = f"downloads/{title}.mp3"
             return fpath, True
         elif video:
             if await is_on_off(1):
-                downloaded_file = await loop.run_in_executor(None, video_dl)
+                downloaded_file = await ytdlpool.download(link, video_opts)
                 return downloaded_file, True
             else:
-                proc = await asyncio.create_subprocess_exec(
-                    "yt-dlp",
-                    "--cookies",
-                    cookie_txt_file(),
-                    "-g",
-                    "-f",
-                    "best[height<=?720][width<=?1280]",
-                    f"{link}",
-                    stdout=asyncio.subprocess.PIPE,
-                    stderr=asyncio.subprocess.PIPE,
+                status, stream_url = await get_stream_url(
+                    link, "best[height<=?720][width<=?1280]"
                 )
-                stdout, _ = await proc.communicate()
-                if stdout:
+                if status:
                     # Direct network stream URL
-                    return stdout.decode().split("\n")[0], False
+                    return stream_url, False
                 else:
                     file_size = await check_file_size(link)
                     if not file_size:
@@ -735,10 +823,15 @@ class YouTubeAPI:
                     total_size_mb = file_size / (1024 * 1024)
                     if total_size_mb > 250:
                         return None, None
-                    downloaded_file = await loop.run_in_executor(None, video_dl)
+                    downloaded_file = await ytdlpool.download(link, video_opts)
                     return downloaded_file, True
         else:
-            downloaded_file = await loop.run_in_executor(None, audio_dl)
+            match = VIDEO_ID.search(link)
+            if config.STREAM_START_BYTES and match:
+                return await stream_audio(link, match.group(1), audio_opts), True
+            start = time.monotonic()
+            downloaded_file = await ytdlpool.download(link, audio_opts)
+            first_audio["full"].append(time.monotonic() - start)
             return downloaded_file, True
 
 
@@ -7,6 +7,7 @@ from Clonify import app
 from Clonify.misc import db
 from Clonify.utils.decorators import AdminRightsCheck
 from Clonify.utils.inline import close_markup
+from Clonify.utils.stream.prefetch import restart_prefetch
 from config import BANNED_USERS
 
 
@@ -28,6 +29,7 @@ async def admins(Client, message: Message, _, chat_id):
         return await message.reply_text(_["admin_15"], reply_markup=close_markup(_))
     random.shuffle(check)
     check.insert(0, popped)
+    restart_prefetch(chat_id)
     await message.reply_text(
         _["admin_16"].format(message.from_user.mention), reply_markup=close_markup(_)
     )
@@ -5,10 +5,11 @@ from Clonify import app
 from Clonify.core.call import PRO
 from Clonify.misc import SUDOERS, db
 from Clonify.utils import AdminRightsCheck
+from Clonify.utils.admincache import get_admins
 from Clonify.utils.database import is_active_chat, is_nonadmin_chat
 from Clonify.utils.decorators.language import languageCB
 from Clonify.utils.inline import close_markup, speed_markup
-from config import BANNED_USERS, adminlist
+from config import BANNED_USERS
 
 checker = []
 
@@ -48,7 +49,7 @@ async def del_back_playlist(client, CallbackQuery, _):
     is_non_admin = await is_nonadmin_chat(CallbackQuery.message.chat.id)
     if not is_non_admin:
         if CallbackQuery.from_user.id not in SUDOERS:
-            admins = adminlist.get(CallbackQuery.message.chat.id)
+            admins = await get_admins(client, CallbackQuery.message.chat.id)
             if not admins:
                 return await CallbackQuery.answer(_["admin_13"], show_alert=True)
             else:
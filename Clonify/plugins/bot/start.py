@@ -4,7 +4,7 @@ import asyncio
 from pyrogram import filters
 from pyrogram.enums import ChatType
 from pyrogram.types import InlineKeyboardButton, InlineKeyboardMarkup, Message
-from youtubesearchpython.__future__ import VideosSearch
+from Clonify.utils.ytmeta import search_one
 
 import config
 from Clonify import app
@@ -65,8 +65,8 @@ async def start_pm(client, message: Message, _):
             m = await message.reply_text("🔎")
             query = (str(name)).replace("info_", "", 1)
             query = f"https://www.youtube.com/watch?v={query}"
-            results = VideosSearch(query, limit=1)
-            for result in (await results.next())["result"]:
+            result = await search_one(query)
+            if result:
                 title = result["title"]
                 duration = result["duration"]
                 views = result["viewCount"]["short"]
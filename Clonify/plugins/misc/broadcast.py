@@ -1,21 +1,16 @@
 import asyncio
 
 from pyrogram import filters
-from pyrogram.enums import ChatMembersFilter
 from pyrogram.errors import FloodWait
 
 from Clonify import app
 from Clonify.misc import SUDOERS
 from Clonify.utils.database import (
-    get_active_chats,
-    get_authuser_names,
     get_client,
-    get_served_chats,
-    get_served_users,
+    iter_served_chats,
+    iter_served_users,
 )
 from Clonify.utils.decorators.language import language
-from Clonify.utils.formatters import alpha_to_int
-from config import adminlist
 
 IS_BROADCASTING = False
 
@@ -50,11 +45,7 @@ async def braodcast_message(client, message, _):
     if "-nobot" not in message.text:
         sent = 0
         pin = 0
-        chats = []
-        schats = await get_served_chats()
-        for chat in schats:
-            chats.append(int(chat["chat_id"]))
-        for i in chats:
+        async for i in iter_served_chats():
             try:
                 m = (
                     await app.forward_messages(i, y, x)
@@ -89,11 +80,7 @@ async def braodcast_message(client, message, _):
 
     if "-user" in message.text:
         susr = 0
-        served_users = []
-        susers = await get_served_users()
-        for user in susers:
-            served_users.append(int(user["user_id"]))
-        for i in served_users:
+        async for i in iter_served_users():
             try:
                 m = (
                     await app.forward_messages(i, y, x)
@@ -145,25 +132,3 @@ async def braodcast_message(client, message, _):
             pass
     IS_BROADCASTING = False
 
-
-async def auto_clean():
-    while not await asyncio.sleep(10):
-        try:
-            served_chats = await get_active_chats()
-            for chat_id in served_chats:
-                if chat_id not in adminlist:
-                    adminlist[chat_id] = []
-                    async for user in app.get_chat_members(
-                        chat_id, filter=ChatMembersFilter.ADMINISTRATORS
-                    ):
-                        if user.privileges.can_manage_video_chats:
-                            adminlist[chat_id].append(user.user.id)
-                    authusers = await get_authuser_names(chat_id)
-                    for user in authusers:
-                        user_id = await alpha_to_int(user)
-                        adminlist[chat_id].append(user_id)
-        except:
-            continue
-
-
-asyncio.create_task(auto_clean())
@@ -0,0 +1,41 @@
+from pyrogram import filters
+
+import config
+from Clonify import app
+from Clonify.misc import SUDOERS
+from Clonify.platforms.Youtube import first_audio, stream_url_stats, stream_urls
+from Clonify.utils.admincache import admin_stats, fetching
+from Clonify.utils.clonefleet import process_stats, restarts, wakes
+from Clonify.utils.stream.mediacache import index
+from Clonify.utils.stream.progress import edit_rate, edit_stats
+from Clonify.utils.thumbnails import render_times, rendering
+from Clonify.utils.ytdlpool import pool_stats
+from Clonify.utils.ytmeta import cache_stats
+
+
+@app.on_message(filters.command(["metrics"]) & SUDOERS)
+async def metrics(client, message):
+    meta = cache_stats()
+    pool = pool_stats()
+    cached = sum(item["size"] for item in index.values()) / (1024 * 1024)
+    ttfa = {
+        kind: round(sum(times) / len(times), 2) if times else 0
+        for kind, times in first_audio.items()
+    }
+    proc = process_stats()
+    render = sum(render_times) / len(render_times) if render_times else 0
+    text = (
+        "<b><u>ʙᴏᴛ ᴍᴇᴛʀɪᴄs :</u></b>\n\n"
+        f"<b>ʏᴛ ᴍᴇᴛᴀᴅᴀᴛᴀ :</b> <code>{meta['hits']} ʜɪᴛs | {meta['mongo_hits']} ᴅʙ ʜɪᴛs | {meta['misses']} ᴍɪssᴇs ({meta['ratio']}%) | {meta['coalesced']} ᴄᴏᴀʟᴇsᴄᴇᴅ | {meta['size']} ᴄᴀᴄʜᴇᴅ</code>\n"
+        f"<b>sᴛʀᴇᴀᴍ ᴜʀʟs :</b> <code>{stream_url_stats['hits']} ʜɪᴛs | {stream_url_stats['misses']} ᴍɪssᴇs | {stream_url_stats['refreshes']} ʀᴇғʀᴇsʜᴇs | {len(stream_urls)} ᴄᴀᴄʜᴇᴅ</code>\n"
+        f"<b>ʏᴛ-ᴅʟᴘ ᴡᴏʀᴋᴇʀs :</b> <code>{pool['workers']} ᴡᴏʀᴋᴇʀs | {pool['queued']} ǫᴜᴇᴜᴇᴅ | {pool['pending']} ᴘᴇɴᴅɪɴɢ | {pool['done']} ᴅᴏɴᴇ | {pool['failed']} ғᴀɪʟᴇᴅ | {pool['timeouts']} ᴛɪᴍᴇᴏᴜᴛs | ᴀᴠɢ {pool['avg']}s | ᴘ95 {pool['p95']}s</code>\n"
+        f"<b>ᴍᴇᴅɪᴀ ᴄᴀᴄʜᴇ :</b> <code>{len(index)} ғɪʟᴇs | {cached:.1f}/{config.MEDIA_CACHE_SIZE} ᴍʙ</code>\n"
+        f"<b>ғɪʀsᴛ ᴀᴜᴅɪᴏ :</b> <code>{ttfa['streamed']}s sᴛʀᴇᴀᴍᴇᴅ ({len(first_audio['streamed'])}) | {ttfa['full']}s ғᴜʟʟ ᴅᴏᴡɴʟᴏᴀᴅ ({len(first_audio['full'])})</code>\n"
+        f"<b>ᴛʜᴜᴍʙɴᴀɪʟs :</b> <code>{render:.2f}s ᴀᴠɢ ʀᴇɴᴅᴇʀ ({len(render_times)}) | {len(rendering)} ʀᴇɴᴅᴇʀɪɴɢ</code>\n"
+        f"<b>ᴀᴅᴍɪɴ ᴄᴀᴄʜᴇ :</b> <code>{admin_stats['hits']} ʜɪᴛs | {admin_stats['misses']} ᴍɪssᴇs | {admin_stats['fetches']} ғᴇᴛᴄʜᴇs | {admin_stats['invalidations']} ɪɴᴠᴀʟɪᴅᴀᴛɪᴏɴs | {admin_stats['failed']} ғᴀɪʟᴇᴅ | {len(config.adminlist)} ᴄʜᴀᴛs | {len(fetching)} ғᴇᴛᴄʜɪɴɢ</code>\n"
+        f"<b>ᴘʀᴏᴄᴇss :</b> <code>{proc['cpu']:.1f}% ᴄᴘᴜ | {proc['rss']:.1f} ᴍʙ ʀss | {proc['lag'] * 1000:.0f}ᴍs ʟᴏᴏᴘ ʟᴀɢ (ᴍᴀx {proc['max_lag'] * 1000:.0f}ᴍs)</code>\n"
+        f"<b>ᴄʟᴏɴᴇs :</b> <code>{proc['clones']} ʀᴜɴɴɪɴɢ | {proc['down']} ᴅᴏᴡɴ | {proc['hibernated']} ʜɪʙᴇʀɴᴀᴛᴇᴅ | {wakes['woken']} ᴡᴏᴋᴇɴ | {restarts['done']} ʀᴇsᴛᴀʀᴛᴇᴅ | {restarts['failed']} ғᴀɪʟᴇᴅ ʀᴇsᴛᴀʀᴛs</code>\n"
+    )
+    for bot_id, stats in edit_stats.items():
+        text += f"<b>ᴘʀᴏɢʀᴇss ᴇᴅɪᴛs [{bot_id}] :</b> <code>{edit_rate(bot_id)}/ᴍɪɴ | {stats['edits']} ᴇᴅɪᴛs | {stats['skipped']} sᴋɪᴘᴘᴇᴅ | {stats['failed']} ғᴀɪʟᴇᴅ | {stats['floodwaits']} ғʟᴏᴏᴅᴡᴀɪᴛs</code>\n"
+    await message.reply_text(text)
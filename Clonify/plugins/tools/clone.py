@@ -11,14 +11,29 @@ from pyrogram.errors.exceptions.bad_request_400 import (
     AccessTokenInvalid,
 )
 from Clonify.utils.database import get_assistant
-from config import API_ID, API_HASH
 from Clonify import app
+from Clonify.utils import clonefleet
+from Clonify.utils.clonefleet import (
+    boot_clones,
+    boot_progress,
+    provision,
+    provision_fleet,
+    start_clone,
+    stop_clone,
+)
 from config import OWNER_ID
 from Clonify.misc import SUDOERS
-from Clonify.utils.database import get_assistant, clonebotdb
-from Clonify.utils.database.clonedb import has_user_cloned_any_bot
+from Clonify.utils.database import get_assistant
+from Clonify.utils.database.clonedb import (
+    delete_all_clones,
+    delete_clone,
+    find_clone,
+    get_user_clones,
+    has_user_cloned_any_bot,
+    load_clones,
+    save_clone,
+)
 from config import LOGGER_ID, CLONE_LOGGER
-import requests
 from Clonify.utils.decorators.language import language
 import pyrogram.errors
 
@@ -63,15 +78,8 @@ async def clone_txt(client, message, _):
         bot_token = message.text.split("/clone", 1)[1].strip()
         mi = await message.reply_text(_["C_B_H_2"])
         try:
-            ai = Client(
-                bot_token,
-                API_ID,
-                API_HASH,
-                bot_token=bot_token,
-                plugins=dict(root="Clonify.cplugin"), 
-            )
-            await ai.start()
-            bot = await ai.get_me()
+            ai = await start_clone(bot_token)
+            bot = ai.me
             bot_users = await ai.get_users(bot.username)
             bot_id = bot_users.id
             c_b_owner_fname = message.from_user.first_name
@@ -107,28 +115,11 @@ async def clone_txt(client, message, _):
                 "premium" : False,
                 "Date" : False,
             }
-            clonebotdb.insert_one(details)
+            await save_clone(details)
             CLONES.add(bot.id)
 
-            def set_bot_commands():
-                url = f"https://api.telegram.org/bot{bot_token}/setMyCommands"
-                
-                params = {"commands": C_BOT_COMMANDS}
-                response = requests.post(url, json=params)
-                print(response.json())
-
-            set_bot_commands()
-
-            def set_bot_desc():
-                url = f"https://api.telegram.org/bot{bot_token}/setMyDescription"
-                params = {"description": C_BOT_DESC}
-                response = requests.post(url, data=params)
-                if response.status_code == 200:
-                    logging.info(f"Successfully updated Description for bot: {bot_token}")
-                else:
-                    logging.error(f"Failed to update Description: {response.text}")
-
-            set_bot_desc()
+            # a clone left out here is caught up by provision_fleet on the next boot
+            await provision(bot.id, bot_token, C_BOT_COMMANDS, C_BOT_DESC)
 
             await mi.edit_text(_["C_B_H_6"].format(bot.username))
         except BaseException as e:
@@ -165,7 +156,7 @@ async def delete_cloned_bot(client, message, _):
             query_value = query_value[1:]
         await message.reply_text(_["C_B_H_9"])
 
-        cloned_bot = clonebotdb.find_one({"$or": [{"token": query_value}, {"username": query_value}]})
+        cloned_bot = await find_clone(query_value)
         
         if cloned_bot:
 
@@ -175,14 +166,15 @@ async def delete_cloned_bot(client, message, _):
            f"**ᴛᴏᴋᴇɴ**: `{cloned_bot['token']}`\n" \
            f"**ᴏᴡɴᴇʀ**: `{cloned_bot['user_id']}`\n"
 
-            C_OWNER = get_owner_id_from_db(cloned_bot['bot_id'])
+            C_OWNER = await get_owner_id_from_db(cloned_bot['bot_id'])
             OWNERS = [OWNER_ID, C_OWNER]
 
             if message.from_user.id not in OWNERS:
                 return await message.reply_text(_["NOT_C_OWNER"].format(SUPPORT_CHAT))
 
-            clonebotdb.delete_one({"_id": cloned_bot["_id"]})
-            CLONES.remove(cloned_bot["bot_id"])
+            await delete_clone(cloned_bot["bot_id"])
+            await stop_clone(cloned_bot["bot_id"])
+            CLONES.discard(cloned_bot["bot_id"])
 
             await message.reply_text(_["C_B_H_10"])
             await app.send_message(
@@ -199,44 +191,30 @@ async def delete_cloned_bot(client, message, _):
 
 
 async def restart_bots():
-    global CLONES
     try:
         logging.info("Restarting all cloned bots........")
-        bots = list(clonebotdb.find())
-        botNumber = 1
-        for bot in bots:
-            bot_token = bot["token"]
-
-            url = f"https://api.telegram.org/bot{bot_token}/getMe"
-            response = requests.get(url)
-            if response.status_code != 200:
-                logging.error(f"Invalid or expired token for bot: {bot_token}")
-                clonebotdb.delete_one({"token": bot_token})
-                continue
-
-            ai = Client(
-                f"{bot_token}",
-                API_ID,
-                API_HASH,
-                bot_token=bot_token,
-                plugins=dict(root="Clonify.cplugin"),
+        bots = await load_clones()
+        try:
+            status = await app.send_message(
+                CLONE_LOGGER, f"Starting {len(bots)} Cloned Bots..."
             )
-            await ai.start()
-            print(botNumber)
-            botNumber += 1
-
-            bot = await ai.get_me()
-            if bot.id not in CLONES:
-                try:
-                    CLONES.add(bot.id)
-                except Exception:
-                    pass
+        except Exception:
+            status = None
 
-            await asyncio.sleep(5)
+        async def report(progress):
+            logging.info(f"Cloned bots : {progress}")
+            try:
+                await status.edit_text(f"Starting Cloned Bots : {progress}")
+            except Exception:
+                pass
 
+        await boot_clones(bots, lambda ai: CLONES.add(ai.me.id), report)
         await app.send_message(
-                CLONE_LOGGER, f"All Cloned Bots Started !"
+                CLONE_LOGGER, f"All Cloned Bots Started ! {boot_progress()}"
             )
+        updated = await provision_fleet(C_BOT_COMMANDS, C_BOT_DESC)
+        if updated:
+            logging.info(f"Updated commands and description of {updated} cloned bots")
     except Exception as e:
         logging.exception("Error while restarting bots.")
 
@@ -247,7 +225,10 @@ async def delete_all_cloned_bots(client, message, _):
     try:
         await message.reply_text(_["C_B_H_14"])
 
-        clonebotdb.delete_many({})
+        await delete_all_clones()
+        # clones left asleep at boot never made it into CLONES
+        for bot_id in list(clonefleet.clients) + list(clonefleet.hibernated):
+            await stop_clone(bot_id)
 
         CLONES.clear()
 
@@ -262,7 +243,7 @@ async def delete_all_cloned_bots(client, message, _):
 async def my_cloned_bots(client, message, _):
     try:
         user_id = message.from_user.id
-        cloned_bots = list(clonebotdb.find({"user_id": user_id}))
+        cloned_bots = await get_user_clones(user_id)
         
         if not cloned_bots:
             await message.reply_text(_["C_B_H_16"])
@@ -286,7 +267,7 @@ async def my_cloned_bots(client, message, _):
 @language
 async def list_cloned_bots(client, message, _):
     try:
-        cloned_bots = list(clonebotdb.find())
+        cloned_bots = await load_clones()
         if not cloned_bots:
             await message.reply_text(_["C_B_H_13"])
             return
@@ -330,7 +311,7 @@ async def list_cloned_bots(client, message, _):
 @language
 async def list_cloned_bots(client, message, _):
     try:
-        cloned_bots = list(clonebotdb.find())
+        cloned_bots = await load_clones()
         if not cloned_bots:
             await message.reply_text("No bots have been cloned yet.")
             return
@@ -2,7 +2,6 @@ import asyncio
 import time
 from pyrogram import Client, filters
 from pyrogram import filters
-from pyrogram.enums import ChatMembersFilter
 from pyrogram.types import CallbackQuery, Message
 import re
 from os import getenv
@@ -16,10 +15,11 @@ load_dotenv()
 from Clonify import app
 from Clonify.core.call import PRO
 from Clonify.misc import db
-from Clonify.utils.database import get_assistant, get_authuser_names, get_cmode
+from Clonify.utils.admincache import invalidate, member_updated, refresh
+from Clonify.utils.database import get_assistant, get_cmode
 from Clonify.utils.decorators import ActualAdminCB, AdminActual, language
-from Clonify.utils.formatters import alpha_to_int, get_readable_time
-from config import BANNED_USERS, adminlist, lyrical
+from Clonify.utils.formatters import get_readable_time
+from config import BANNED_USERS, lyrical
 BOT_TOKEN = getenv("BOT_TOKEN", "")
 MONGO_DB_URI = getenv("MONGO_DB_URI", "")
 STRING_SESSION = getenv("STRING_SESSION", "")
@@ -46,16 +46,8 @@ async def reload_admin_cache(client, message: Message, _):
             if saved > time.time():
                 left = get_readable_time((int(saved) - int(time.time())))
                 return await message.reply_text(_["reload_1"].format(left))
-        adminlist[message.chat.id] = []
-        async for user in app.get_chat_members(
-            message.chat.id, filter=ChatMembersFilter.ADMINISTRATORS
-        ):
-            if user.privileges.can_manage_video_chats:
-                adminlist[message.chat.id].append(user.user.id)
-        authusers = await get_authuser_names(message.chat.id)
-        for user in authusers:
-            user_id = await alpha_to_int(user)
-            adminlist[message.chat.id].append(user_id)
+        invalidate(message.chat.id)
+        await refresh(client, message.chat.id)
         now = int(time.time()) + 180
         rel[message.chat.id] = now
         await message.reply_text(_["reload_2"])
@@ -63,6 +55,11 @@ async def reload_admin_cache(client, message: Message, _):
         await message.reply_text(_["reload_3"])
 
 
+@app.on_chat_member_updated(filters.group, group=7)
+async def admin_changed(client, update):
+    await member_updated(client, update)
+
+
 @app.on_message(filters.command(["reboot"]) & filters.group & ~BANNED_USERS)
 @AdminActual
 async def restartbot(client, message: Message, _):
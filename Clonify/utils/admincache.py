@@ -0,0 +1,115 @@
+import asyncio
+import time
+
+from pyrogram.enums import ChatMemberStatus, ChatMembersFilter
+from pyrogram.errors import FloodWait
+
+import config
+from Clonify.logging import LOGGER
+from Clonify.utils.database import get_authuser_names
+from Clonify.utils.formatters import alpha_to_int
+from config import adminlist
+
+# chat_id -> monotonic time after which its admin list is fetched again
+expires = {}
+# chat_id -> fetch in flight
+fetching = {}
+# chat_id -> monotonic time until which a chat whose first fetch failed is not
+# asked again, its admin commands see an empty list meanwhile
+failed = {}
+admin_stats = {"hits": 0, "misses": 0, "fetches": 0, "invalidations": 0, "failed": 0}
+
+ADMINS = (ChatMemberStatus.OWNER, ChatMemberStatus.ADMINISTRATOR)
+
+
+async def _fetch(client, chat_id):
+    admin_stats["fetches"] += 1
+    admins = []
+    async for member in client.get_chat_members(
+        chat_id, filter=ChatMembersFilter.ADMINISTRATORS
+    ):
+        if member.privileges and member.privileges.can_manage_video_chats:
+            admins.append(member.user.id)
+    for user in await get_authuser_names(chat_id):
+        admins.append(await alpha_to_int(user))
+    # an invalidation while this was running makes the result outdated
+    if fetching.get(chat_id) is asyncio.current_task():
+        adminlist[chat_id] = admins
+        expires[chat_id] = time.monotonic() + config.ADMIN_CACHE_TTL
+        failed.pop(chat_id, None)
+    return admins
+
+
+def _done(chat_id, task):
+    if fetching.get(chat_id) is task:
+        fetching.pop(chat_id)
+    if task.cancelled():
+        return
+    e = task.exception()
+    if e:
+        LOGGER(__name__).warning(f"Could not fetch admins of {chat_id} : {e}")
+        retry = time.monotonic() + max(e.value if isinstance(e, FloodWait) else 0, 60)
+        if chat_id in adminlist:
+            # keep serving the old list, try again in a minute or after the FloodWait
+            expires[chat_id] = retry
+        else:
+            failed[chat_id] = retry
+
+
+def refresh(client, chat_id) -> asyncio.Task:
+    task = fetching.get(chat_id)
+    if task is None:
+        task = fetching[chat_id] = asyncio.create_task(_fetch(client, chat_id))
+        task.add_done_callback(lambda t: _done(chat_id, t))
+    return task
+
+
+def invalidate(chat_id):
+    admin_stats["invalidations"] += 1
+    expires.pop(chat_id, None)
+    failed.pop(chat_id, None)
+    fetching.pop(chat_id, None)
+
+
+async def get_admins(client, chat_id) -> list:
+    """Users allowed to manage the stream in a chat.
+
+    Only the first call for a chat waits for the member list, after that an
+    expired list is served while it is fetched again in the background."""
+    admins = adminlist.get(chat_id)
+    if admins is not None:
+        admin_stats["hits"] += 1
+        if expires.get(chat_id, 0) < time.monotonic():
+            refresh(client, chat_id)
+        return admins
+    if failed.get(chat_id, 0) > time.monotonic():
+        admin_stats["failed"] += 1
+        return []
+    admin_stats["misses"] += 1
+    try:
+        return await asyncio.shield(refresh(client, chat_id))
+    except asyncio.CancelledError:
+        raise
+    except:
+        return []
+
+
+async def member_updated(client, update):
+    chat_id = update.chat.id
+    if chat_id not in adminlist:
+        return
+    old, new = update.old_chat_member, update.new_chat_member
+    if not (old and old.status in ADMINS) and not (new and new.status in ADMINS):
+        return
+    invalidate(chat_id)
+    user = (new or old).user
+    if user and not (
+        new
+        and new.status in ADMINS
+        and new.privileges
+        and new.privileges.can_manage_video_chats
+    ):
+        # drop the rights right away, an auth user is added back by the fetch
+        while user.id in adminlist[chat_id]:
+            adminlist[chat_id].remove(user.id)
+    refresh(client, chat_id)
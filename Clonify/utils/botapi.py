@@ -0,0 +1,58 @@
+import asyncio
+
+import aiohttp
+
+import config
+
+_session = None
+
+
+def _client() -> aiohttp.ClientSession:
+    global _session
+    if _session is None or _session.closed:
+        _session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=config.BOTAPI_POOL_SIZE),
+            timeout=aiohttp.ClientTimeout(total=20),
+        )
+    return _session
+
+
+async def call(token: str, method: str, **params) -> dict:
+    """Call a bot api method as the bot owning the token.
+
+    Flood waits are slept through and network or server errors retried, the
+    answer of telegram is returned as is, with error_code None if none came."""
+    url = f"https://api.telegram.org/bot{token}/{method}"
+    error = "no answer"
+    for attempt in range(config.BOTAPI_RETRIES):
+        try:
+            async with _client().post(url, json=params) as resp:
+                data = await resp.json(content_type=None)
+        except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+            error = str(e) or type(e).__name__
+            await asyncio.sleep(2**attempt)
+            continue
+        if resp.status == 429:
+            await asyncio.sleep(data.get("parameters", {}).get("retry_after", 5))
+            continue
+        if resp.status >= 500:
+            error = data.get("description", resp.status)
+            await asyncio.sleep(2**attempt)
+            continue
+        return data
+    return {"ok": False, "error_code": None, "description": error}
+
+
+async def updates(token: str, **params) -> dict:
+    """One getUpdates request, long-polling for params["timeout"] seconds.
+
+    Errors are raised, not retried, the caller decides when to poll again."""
+    url = f"https://api.telegram.org/bot{token}/getUpdates"
+    timeout = aiohttp.ClientTimeout(total=params.get("timeout", 0) + 20)
+    async with _client().get(url, params=params, timeout=timeout) as resp:
+        return await resp.json(content_type=None)
+
+
+async def close():
+    if _session and not _session.closed:
+        await _session.close()
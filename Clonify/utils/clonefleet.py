@@ -0,0 +1,377 @@
+import asyncio
+import hashlib
+import json
+import time
+from collections import deque
+
+import aiohttp
+import psutil
+from pyrogram.errors import AccessTokenExpired, AccessTokenInvalid, FloodWait
+
+import config
+from Clonify.core.fileids import FileIdClient, file_ids
+from Clonify.logging import LOGGER
+from Clonify.misc import db
+from Clonify.utils import botapi
+from Clonify.utils.database.clonedb import clonebots, delete_clone, update_clone
+
+# bot_id -> running clone client
+clients = {}
+boot = {"total": 0, "started": 0, "asleep": 0, "invalid": 0, "failed": 0, "running": False}
+# monotonic time until which nobody logs in, set by the last FloodWait
+paused_until = 0
+# bot_id -> (restart attempts, monotonic time of the next one) of dead clones
+backoff = {}
+restarts = {"done": 0, "failed": 0}
+loop_lag = deque(maxlen=60)
+# bot_id -> monotonic time of the last update a clone received
+last_active = {}
+# bot_id -> monotonic time last_active was last written to the clone's document
+_saved = {}
+# bot_id -> token of the clones whose client was stopped for being idle
+hibernated = {}
+# bot_id -> task long-polling the bot api until that clone gets an update
+pollers = {}
+wakes = {"hibernated": 0, "woken": 0}
+_process = psutil.Process()
+
+
+def boot_progress() -> str:
+    text = f"{boot['started']}/{boot['total']} started, {boot['invalid']} invalid"
+    if boot["asleep"]:
+        text += f", {boot['asleep']} left asleep"
+    if boot["failed"]:
+        text += f", {boot['failed']} failed"
+    return text
+
+
+async def _token_valid(token: str):
+    """True or False once Telegram answered, None when it could not be asked."""
+    data = await botapi.call(token, "getMe")
+    if data.get("ok"):
+        return True
+    if data.get("error_code") in (401, 404):
+        return False
+    return None
+
+
+async def _pace():
+    while paused_until > time.monotonic():
+        await asyncio.sleep(paused_until - time.monotonic())
+
+
+def _save_active(bot_id: int):
+    # as wall clock time, so it still means something after a restart
+    seen = time.time() - (time.monotonic() - last_active[bot_id])
+    _saved[bot_id] = time.monotonic()
+    asyncio.create_task(update_clone(bot_id, {"last_active": seen}))
+
+
+def touch(bot_id: int):
+    last_active[bot_id] = time.monotonic()
+    if _saved.get(bot_id, 0) < last_active[bot_id] - config.CLONE_ACTIVE_SAVE_INTERVAL:
+        _save_active(bot_id)
+
+
+async def start_clone(token: str, catch_up: bool = False) -> FileIdClient:
+    global paused_until
+    client = FileIdClient(
+        token,
+        config.API_ID,
+        config.API_HASH,
+        bot_token=token,
+        plugins=dict(root="Clonify.cplugin"),
+        # a woken clone replays the updates that arrived while it slept
+        skip_updates=not catch_up,
+    )
+    while True:
+        await _pace()
+        try:
+            await client.start()
+            break
+        except FloodWait as e:
+            # the limit is on logins from this server, hold every worker back
+            paused_until = max(paused_until, time.monotonic() + e.value)
+    clients[client.me.id] = client
+    # logging in is not activity, it only starts the idle clock
+    last_active[client.me.id] = time.monotonic()
+    return client
+
+
+async def _boot_one(bot, semaphore, on_started):
+    async with semaphore:
+        if bot["bot_id"] in clients:
+            # started on request while the fleet was booting
+            return
+        valid = await _token_valid(bot["token"])
+        if valid is False:
+            LOGGER(__name__).error(f"Invalid or expired token for clone {bot['bot_id']}")
+            boot["invalid"] += 1
+            await delete_clone(bot["bot_id"])
+            return
+        idle = time.time() - bot.get("last_active", time.time())
+        if config.CLONE_IDLE_TIMEOUT and idle > config.CLONE_IDLE_TIMEOUT:
+            # idle before the restart too, no need to log it in just to stop it
+            _sleep(bot["bot_id"], bot["token"])
+            boot["asleep"] += 1
+            return
+        try:
+            client = await start_clone(bot["token"])
+        except (AccessTokenExpired, AccessTokenInvalid):
+            boot["invalid"] += 1
+            await delete_clone(bot["bot_id"])
+            return
+        except Exception as e:
+            LOGGER(__name__).warning(f"Could not start clone {bot['bot_id']} : {e}")
+            boot["failed"] += 1
+            return
+        boot["started"] += 1
+        on_started(client)
+
+
+async def boot_clones(bots: list, on_started, report=None):
+    """Start every clone, a few at a time, calling report() now and then."""
+    boot.update(total=len(bots), started=0, asleep=0, invalid=0, failed=0, running=True)
+    semaphore = asyncio.Semaphore(config.CLONE_BOOT_CONCURRENCY)
+    try:
+        pending = {
+            asyncio.create_task(_boot_one(bot, semaphore, on_started)) for bot in bots
+        }
+        while pending:
+            _, pending = await asyncio.wait(pending, timeout=10)
+            if report:
+                await report(boot_progress())
+    finally:
+        boot["running"] = False
+
+
+def profile_digest(commands: list, description: str) -> str:
+    profile = json.dumps([commands, description], sort_keys=True)
+    return hashlib.sha1(profile.encode()).hexdigest()
+
+
+async def provision(bot_id: int, token: str, commands: list, description: str) -> bool:
+    """Set the command list and description of a clone."""
+    results = await asyncio.gather(
+        botapi.call(token, "setMyCommands", commands=commands),
+        botapi.call(token, "setMyDescription", description=description),
+    )
+    for method, data in zip(("setMyCommands", "setMyDescription"), results):
+        if not data.get("ok"):
+            LOGGER(__name__).warning(
+                f"{method} failed for clone {bot_id} : {data.get('description')}"
+            )
+    if not all(data.get("ok") for data in results):
+        return False
+    await update_clone(bot_id, {"profile": profile_digest(commands, description)})
+    return True
+
+
+async def provision_fleet(commands: list, description: str) -> int:
+    """Apply the commands and description to every clone that was set up with
+    other ones, returns how many were updated."""
+    digest = profile_digest(commands, description)
+    semaphore = asyncio.Semaphore(config.PROVISION_CONCURRENCY)
+
+    async def apply(bot):
+        async with semaphore:
+            try:
+                return await provision(bot["bot_id"], bot["token"], commands, description)
+            except Exception as e:
+                LOGGER(__name__).warning(f"Could not provision clone {bot['bot_id']} : {e}")
+                return False
+
+    stale = [bot for bot in list(clonebots.values()) if bot.get("profile") != digest]
+    return sum(await asyncio.gather(*(apply(bot) for bot in stale)))
+
+
+async def stop_clone(bot_id: int):
+    backoff.pop(bot_id, None)
+    last_active.pop(bot_id, None)
+    _saved.pop(bot_id, None)
+    hibernated.pop(bot_id, None)
+    task = pollers.pop(bot_id, None)
+    if task:
+        task.cancel()
+    client = clients.pop(bot_id, None)
+    if client and client.is_connected:
+        try:
+            await client.stop()
+        except Exception as e:
+            LOGGER(__name__).warning(f"Could not stop clone {bot_id} : {e}")
+
+
+async def _revive(bot_id, client):
+    attempts, _ = backoff.get(bot_id, (0, 0))
+    try:
+        await _pace()
+        try:
+            # whatever is left of the old session has to go before logging in
+            await client.stop()
+        except Exception:
+            pass
+        await client.start()
+    except (AccessTokenExpired, AccessTokenInvalid):
+        LOGGER(__name__).error(f"Clone {bot_id} lost its token, removing it")
+        clients.pop(bot_id, None)
+        backoff.pop(bot_id, None)
+        await delete_clone(bot_id)
+        return
+    except Exception as e:
+        restarts["failed"] += 1
+        delay = min(config.CLONE_RESTART_DELAY * 2**attempts, 600)
+        backoff[bot_id] = (attempts + 1, time.monotonic() + delay)
+        LOGGER(__name__).warning(
+            f"Could not restart clone {bot_id} : {e}, next try in {delay}s"
+        )
+        return
+    restarts["done"] += 1
+    backoff.pop(bot_id, None)
+
+
+def _streaming(bot_id) -> bool:
+    return any(queue and queue[0].get("bot_id") == bot_id for queue in db.values())
+
+
+def _sleep(bot_id: int, token: str):
+    hibernated[bot_id] = token
+    wakes["hibernated"] += 1
+    pollers[bot_id] = asyncio.create_task(_poll(bot_id))
+
+
+async def hibernate(bot_id: int):
+    """Stop an idle clone, keeping only its token and a bot api long-poll."""
+    client = clients.pop(bot_id, None)
+    if not client:
+        return
+    backoff.pop(bot_id, None)
+    hibernated[bot_id] = client.bot_token
+    if bot_id in last_active and bot_id not in _saved:
+        # idle since it was started, the next boot leaves it asleep
+        _save_active(bot_id)
+    try:
+        await client.stop()
+    except Exception as e:
+        LOGGER(__name__).warning(f"Could not stop clone {bot_id} : {e}")
+    file_ids.pop(bot_id, None)
+    _sleep(bot_id, client.bot_token)
+
+
+async def wake(bot_id: int):
+    token = hibernated.pop(bot_id, None)
+    task = pollers.pop(bot_id, None)
+    if task and task is not asyncio.current_task():
+        task.cancel()
+    if token is None:
+        return clients.get(bot_id)
+    try:
+        client = await start_clone(token, catch_up=True)
+    except (AccessTokenExpired, AccessTokenInvalid):
+        LOGGER(__name__).error(f"Clone {bot_id} lost its token, removing it")
+        await delete_clone(bot_id)
+        return None
+    except Exception as e:
+        LOGGER(__name__).warning(f"Could not wake clone {bot_id} : {e}")
+        hibernated[bot_id] = token
+        pollers[bot_id] = asyncio.create_task(_poll(bot_id))
+        return None
+    wakes["woken"] += 1
+    return client
+
+
+async def _poll(bot_id):
+    token = hibernated[bot_id]
+    delay = 5
+    while bot_id in hibernated:
+        # a long-poll holds one of the BOTAPI_POOL_SIZE connections, past half
+        # of them the sleeping clones take turns with quick polls instead
+        wait = 50 if len(pollers) < config.BOTAPI_POOL_SIZE // 2 else 0
+        try:
+            # without an offset nothing is confirmed, the woken client still
+            # gets these updates through its own session
+            data = await botapi.updates(token, timeout=wait)
+        except (aiohttp.ClientError, asyncio.TimeoutError, ValueError):
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 300)
+            continue
+        if data.get("error_code") in (401, 404):
+            LOGGER(__name__).error(f"Clone {bot_id} lost its token, removing it")
+            hibernated.pop(bot_id, None)
+            pollers.pop(bot_id, None)
+            await delete_clone(bot_id)
+            return
+        if not data.get("ok"):
+            await asyncio.sleep(data.get("parameters", {}).get("retry_after", delay))
+            continue
+        delay = 5
+        if data["result"]:
+            # drop them from the bot api queue or the next sleep ends at once
+            last = data["result"][-1]["update_id"]
+            try:
+                await botapi.updates(token, offset=last + 1, timeout=0)
+            except (aiohttp.ClientError, asyncio.TimeoutError, ValueError):
+                pass
+            break
+        if not wait:
+            await asyncio.sleep(config.CLONE_WATCH_INTERVAL)
+    if bot_id in hibernated:
+        await wake(bot_id)
+
+
+async def _alive(client) -> bool:
+    # is_connected only turns False on an explicit disconnect, a dead session
+    # shows up as a request that never gets an answer
+    if not client.is_connected:
+        return False
+    try:
+        await asyncio.wait_for(client.get_me(), timeout=15)
+    except Exception:
+        return False
+    return True
+
+
+async def _measure_lag():
+    while True:
+        start = time.monotonic()
+        await asyncio.sleep(1)
+        loop_lag.append(time.monotonic() - start - 1)
+
+
+async def supervise():
+    """Restart clones that stopped answering, backing off on repeated failures,
+    and put the ones idle for CLONE_IDLE_TIMEOUT seconds to sleep."""
+    asyncio.create_task(_measure_lag())
+    while not await asyncio.sleep(config.CLONE_WATCH_INTERVAL):
+        now = time.monotonic()
+        checks = {}
+        for bot_id, client in list(clients.items()):
+            if (
+                config.CLONE_IDLE_TIMEOUT
+                and last_active.get(bot_id, 0) < now - config.CLONE_IDLE_TIMEOUT
+                and not _streaming(bot_id)
+            ):
+                await hibernate(bot_id)
+            elif bot_id in backoff:
+                if backoff[bot_id][1] <= now:
+                    await _revive(bot_id, client)
+            elif last_active.get(bot_id, 0) < now - config.CLONE_WATCH_INTERVAL:
+                # a clone that got an update since the last round is alive
+                checks[bot_id] = client
+        alive = await asyncio.gather(*(_alive(client) for client in checks.values()))
+        for (bot_id, client), ok in zip(checks.items(), alive):
+            if not ok and clients.get(bot_id) is client:
+                LOGGER(__name__).warning(f"Clone {bot_id} stopped answering, restarting it")
+                await _revive(bot_id, client)
+
+
+def process_stats() -> dict:
+    lags = list(loop_lag)
+    return {
+        "cpu": _process.cpu_percent(interval=None),
+        "rss": _process.memory_info().rss / (1024 * 1024),
+        "lag": sum(lags) / len(lags) if lags else 0,
+        "max_lag": max(lags) if lags else 0,
+        "clones": len(clients),
+        "down": len(backoff),
+        "hibernated": len(hibernated),
+    }
@@ -3,6 +3,7 @@ from typing import Dict, List, Union
 
 cloneownerdb = mongodb.cloneownerdb
 clonebotdb = pymongodb.clonebotdb
+clonebotsdb = mongodb.clonebotdb
 clonebotnamedb = mongodb.clonebotnamedb
 
 
@@ -33,20 +34,78 @@ async def get_clonebot_username(bot_id):
 
 # new clone 
 
+# every clone bot document by bot_id, loaded at boot so handlers never wait on
+# the database for them
+clonebots = {}
+
+
+async def load_clones() -> list:
+    bots = {bot["bot_id"]: bot async for bot in clonebotsdb.find({}, {"_id": 0})}
+    clonebots.clear()
+    clonebots.update(bots)
+    return list(bots.values())
+
+
+async def get_clone(bot_id: int) -> Union[dict, None]:
+    bot = clonebots.get(bot_id)
+    if bot is None:
+        bot = await clonebotsdb.find_one({"bot_id": bot_id}, {"_id": 0})
+        if bot:
+            clonebots[bot_id] = bot
+    return bot
+
+
+async def find_clone(token_or_username: str) -> Union[dict, None]:
+    for bot in clonebots.values():
+        if token_or_username in (bot.get("token"), bot.get("username")):
+            return bot
+    return await clonebotsdb.find_one(
+        {"$or": [{"token": token_or_username}, {"username": token_or_username}]},
+        {"_id": 0},
+    )
+
+
+async def get_user_clones(user_id: int) -> list:
+    return [bot async for bot in clonebotsdb.find({"user_id": user_id}, {"_id": 0})]
+
+
+async def save_clone(details: dict):
+    await clonebotsdb.insert_one(dict(details))
+    clonebots[details["bot_id"]] = details
+
+
+async def update_clone(bot_id: int, fields: dict, upsert: bool = False):
+    result = await clonebotsdb.update_one(
+        {"bot_id": bot_id}, {"$set": fields}, upsert=upsert
+    )
+    if bot_id in clonebots:
+        clonebots[bot_id].update(fields)
+    return result
+
+
+async def delete_clone(bot_id: int):
+    clonebots.pop(bot_id, None)
+    await clonebotsdb.delete_many({"bot_id": bot_id})
+
+
+async def delete_all_clones():
+    clonebots.clear()
+    await clonebotsdb.delete_many({})
+
+
 # Function to get owner_id dynamically for a given bot_id
-def get_owner_id_from_db(bot_id):
-    # MongoDB query to find the bot data using bot_id
-    bot_data = clonebotdb.find_one({"bot_id": bot_id})
+async def get_owner_id_from_db(bot_id):
+    bot_data = await get_clone(bot_id)
     if bot_data:
         return bot_data["user_id"]  # Assuming 'user_id' is the owner of the bot
     return None  # If no bot is found, return None
 
 #check premium -------------
-def check_bot_premium(bot_id):
-    bot_details = clonebotdb.find_one({"bot_id": bot_id})
+async def check_bot_premium(bot_id):
+    bot_details = await get_clone(bot_id)
 
     if bot_details:
-        if bot_details["premium"]:
+        if bot_details.get("premium"):
             return True 
         else:
             return False
@@ -54,36 +113,21 @@ def check_bot_premium(bot_id):
         return None
 #check premium --------------
 
-"""
-# Function to get Support Chats dynamically for a given bot_id
-def get_cloned_support_chat(bot_id):
-    # MongoDB query to find the bot data using bot_id
-    bot_data = clonebotdb.find_one({"bot_id": bot_id})
-    if bot_data:
-        return bot_data["support"]
-    return None
-
-# Function to get Support Channel dynamically for a given bot_id
-def get_cloned_support_channel(bot_id):
-    # MongoDB query to find the bot data using bot_id
-    bot_data = clonebotdb.find_one({"bot_id": bot_id})
-    if bot_data:
-        return bot_data["channel"]
-    return None
-"""
 
 async def get_cloned_support_chat(bot_id: int) -> str:
-    bot_details = clonebotdb.find_one({"bot_id": bot_id})
+    bot_details = await get_clone(bot_id) or {}
     return bot_details.get("support", "No support chat set.")
 
 async def get_cloned_support_channel(bot_id: int) -> str:
-    bot_details = clonebotdb.find_one({"bot_id": bot_id})
+    bot_details = await get_clone(bot_id) or {}
     return bot_details.get("channel", "No channel set.")
 
 
 async def has_user_cloned_any_bot(user_id: int) -> bool:
     # Check if the user has cloned any bot (search by user_id)
-    cloned_bot = clonebotdb.find_one({"user_id": user_id})
+    if any(bot.get("user_id") == user_id for bot in clonebots.values()):
+        return True
+    cloned_bot = await clonebotsdb.find_one({"user_id": user_id}, {"_id": 1})
     
     if cloned_bot:
         return True
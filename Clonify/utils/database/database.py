@@ -1,8 +1,16 @@
-import random
+import asyncio
+import time
+from datetime import datetime
 from typing import Dict, List, Union
 
+from pymongo import ReturnDocument, UpdateOne
+from pymongo.errors import BulkWriteError
+
+import config
 from Clonify import userbot
 from Clonify.core.mongo import mongodb, pymongodb
+from Clonify.logging import LOGGER
+from Clonify.utils.exceptions import AssistantErr
 
 authdb = mongodb.adminauth
 authuserdb = mongodb.authuser
@@ -29,25 +37,19 @@ userdb = mongodb.userstats
 videodb = mongodb.vipvideocalls
 chatsdbc = mongodb.chatsc  # for clone
 usersdbc = mongodb.tgusersdbc  # for clone
+ytmetadb = mongodb.ytmetadata
+settingsdb = mongodb.chatsettings
+flagsdb = mongodb.flags
 
 # Shifting to memory [mongo sucks often]
 active = []
 activevideo = []
 assistantdict = {}
 autoend = {}
-count = {}
-channelconnect = {}
-langm = {}
 loop = {}
-maintenance = []
-nonadmin = {}
 pause = {}
-playmode = {}
-playtype = {}
-skipmode = {}
 privatechats = {}
 cleanmode = []
-suggestion = {}
 mute = {}
 audio = {}
 video = {}
@@ -111,20 +113,47 @@ async def get_assistant_number(chat_id: int) -> str:
 
 
 async def get_client(assistant: int):
-    if int(assistant) == 1:
-        return userbot.one
-    elif int(assistant) == 2:
-        return userbot.two
-    elif int(assistant) == 3:
-        return userbot.three
-    elif int(assistant) == 4:
-        return userbot.four
-    elif int(assistant) == 5:
-        return userbot.five
+    return userbot.clients.get(int(assistant))
+
+
+async def get_assistant_load() -> Dict[int, Dict[str, int]]:
+    from Clonify.core.userbot import assistants
+
+    load = {num: {"calls": 0, "video": 0} for num in assistants}
+    for chat_id in active:
+        num = assistantdict.get(chat_id)
+        if num not in load:
+            continue
+        load[num]["calls"] += 1
+        if chat_id in activevideo:
+            load[num]["video"] += 1
+    return load
+
+
+async def least_loaded_assistant() -> int:
+    load = await get_assistant_load()
+    if not load:
+        # every assistant failed over, there is nobody to hand the chat to
+        raise AssistantErr("» ɴᴏ ᴀssɪsᴛᴀɴᴛ ɪs ᴀᴠᴀɪʟᴀʙʟᴇ ʀɪɢʜᴛ ɴᴏᴡ, ᴘʟᴇᴀsᴇ ᴛʀʏ ᴀɢᴀɪɴ ɪɴ ᴀ ғᴇᴡ ᴍɪɴᴜᴛᴇs.")
+    # a video call keeps a much heavier ffmpeg pipeline busy than an audio one
+    return min(
+        load,
+        key=lambda num: (
+            load[num]["calls"] + load[num]["video"],
+            load[num]["video"],
+            num,
+        ),
+    )
+
+
+async def get_assistant_chats(assistant: int) -> List[int]:
+    """Active chats whose call runs on this assistant."""
+    return [chat_id for chat_id in active if assistantdict.get(chat_id) == assistant]
 
 
 async def set_assistant_new(chat_id, number):
     number = int(number)
+    assistantdict[chat_id] = number
     await assdb.update_one(
         {"chat_id": chat_id},
         {"$set": {"assistant": number}},
@@ -133,15 +162,8 @@ async def set_assistant_new(chat_id, number):
 
 
 async def set_assistant(chat_id):
-    from Clonify.core.userbot import assistants
-
-    ran_assistant = random.choice(assistants)
-    assistantdict[chat_id] = ran_assistant
-    await assdb.update_one(
-        {"chat_id": chat_id},
-        {"$set": {"assistant": ran_assistant}},
-        upsert=True,
-    )
+    ran_assistant = await least_loaded_assistant()
+    await set_assistant_new(chat_id, ran_assistant)
     userbot = await get_client(ran_assistant)
     return userbot
 
@@ -174,15 +196,8 @@ async def get_assistant(chat_id: int) -> str:
 
 
 async def set_calls_assistant(chat_id):
-    from Clonify.core.userbot import assistants
-
-    ran_assistant = random.choice(assistants)
-    assistantdict[chat_id] = ran_assistant
-    await assdb.update_one(
-        {"chat_id": chat_id},
-        {"$set": {"assistant": ran_assistant}},
-        upsert=True,
-    )
+    ran_assistant = await least_loaded_assistant()
+    await set_assistant_new(chat_id, ran_assistant)
     return ran_assistant
 
 
@@ -206,78 +221,159 @@ async def group_assistant(self, chat_id: int) -> int:
             assis = assistant
         else:
             assis = await set_calls_assistant(chat_id)
-    if int(assis) == 1:
-        return self.one
-    elif int(assis) == 2:
-        return self.two
-    elif int(assis) == 3:
-        return self.three
-    elif int(assis) == 4:
-        return self.four
-    elif int(assis) == 5:
-        return self.five
+    return self.calls.get(int(assis))
+
+
+# --------------------
+# Chat settings
+# --------------------
+# every chat keeps its settings in one document, missing fields are defaults
+SETTINGS = {
+    "lang": "en",
+    "playmode": "Direct",
+    "playtype": "Everyone",
+    "cmode": None,
+    "skipmode": True,
+    "suggestion": True,
+    "upvotes": 5,
+    "nonadmin": False,
+}
+# chat_id -> fields stored for it, {} for a chat that has none
+chatsettings = {}
+# chat_id -> fields changed but not written yet
+unsaved = {}
+settings_preloaded = False
+flusher = None
+
+
+async def _chat_settings(chat_id: int) -> dict:
+    settings = chatsettings.get(chat_id)
+    if settings is None:
+        doc = None
+        if not settings_preloaded:
+            doc = await settingsdb.find_one(
+                {"chat_id": chat_id}, {"_id": 0, "chat_id": 0}
+            )
+        settings = chatsettings.setdefault(chat_id, doc or {})
+    return settings
+
+
+async def get_setting(chat_id: int, field: str):
+    return (await _chat_settings(chat_id)).get(field, SETTINGS[field])
+
+
+async def set_setting(chat_id: int, field: str, value):
+    global flusher
+    (await _chat_settings(chat_id))[field] = value
+    unsaved.setdefault(chat_id, {})[field] = value
+    if flusher is None or flusher.done():
+        flusher = asyncio.create_task(_flush_later())
+
+
+async def _flush_later():
+    await asyncio.sleep(config.SETTINGS_FLUSH_INTERVAL)
+    await flush_settings()
+
+
+async def flush_settings():
+    if not unsaved:
+        return
+    pending = dict(unsaved)
+    unsaved.clear()
+    try:
+        await settingsdb.bulk_write(
+            [
+                UpdateOne({"chat_id": chat_id}, {"$set": fields}, upsert=True)
+                for chat_id, fields in pending.items()
+            ],
+            ordered=False,
+        )
+    except Exception as e:
+        LOGGER(__name__).warning(f"Could not save chat settings : {e}")
+        for chat_id, fields in pending.items():
+            unsaved[chat_id] = dict(fields, **unsaved.get(chat_id, {}))
+
+
+async def _migrate_settings():
+    # chat settings used to live in one collection per setting
+    docs = {}
+
+    async def merge(collection, field, value):
+        async for item in collection.find({}, {"_id": 0}):
+            if "chat_id" in item:
+                docs.setdefault(item["chat_id"], {})[field] = value(item)
+
+    await merge(langdb, "lang", lambda item: item["lang"])
+    await merge(playmodedb, "playmode", lambda item: item["mode"])
+    await merge(playtypedb, "playtype", lambda item: item["mode"])
+    await merge(channeldb, "cmode", lambda item: item["mode"])
+    await merge(countdb, "upvotes", lambda item: item["mode"])
+    await merge(skipdb, "skipmode", lambda item: False)
+    await merge(suggdb, "suggestion", lambda item: False)
+    await merge(authdb, "nonadmin", lambda item: True)
+    if docs:
+        await settingsdb.bulk_write(
+            [
+                UpdateOne({"chat_id": chat_id}, {"$setOnInsert": fields}, upsert=True)
+                for chat_id, fields in docs.items()
+            ],
+            ordered=False,
+        )
+        LOGGER(__name__).info(f"Moved the settings of {len(docs)} chats to chatsettings")
+
+
+async def load_settings():
+    """Load every stored chat setting in one query.
+
+    Only chats that changed something have a document, so once this ran any
+    other chat is known to use the defaults and never queries the database."""
+    global settings_preloaded
+    if not await settingsdb.find_one({}, {"_id": 1}):
+        await _migrate_settings()
+    if not config.SETTINGS_PRELOAD:
+        return
+    async for item in settingsdb.find({}, {"_id": 0}):
+        chat_id = item.pop("chat_id", None)
+        if chat_id is not None and chat_id not in chatsettings:
+            chatsettings[chat_id] = item
+    settings_preloaded = True
+    LOGGER(__name__).info(f"Loaded the settings of {len(chatsettings)} chats")
 
 
 async def is_skipmode(chat_id: int) -> bool:
-    mode = skipmode.get(chat_id)
-    if not mode:
-        user = await skipdb.find_one({"chat_id": chat_id})
-        if not user:
-            skipmode[chat_id] = True
-            return True
-        skipmode[chat_id] = False
-        return False
-    return mode
+    return await get_setting(chat_id, "skipmode")
 
 
 async def skip_on(chat_id: int):
-    skipmode[chat_id] = True
-    user = await skipdb.find_one({"chat_id": chat_id})
-    if user:
-        return await skipdb.delete_one({"chat_id": chat_id})
+    await set_setting(chat_id, "skipmode", True)
 
 
 async def skip_off(chat_id: int):
-    skipmode[chat_id] = False
-    user = await skipdb.find_one({"chat_id": chat_id})
-    if not user:
-        return await skipdb.insert_one({"chat_id": chat_id})
+    await set_setting(chat_id, "skipmode", False)
 
 
 async def get_upvote_count(chat_id: int) -> int:
-    mode = count.get(chat_id)
-    if not mode:
-        mode = await countdb.find_one({"chat_id": chat_id})
-        if not mode:
-            return 5
-        count[chat_id] = mode["mode"]
-        return mode["mode"]
-    return mode
+    return await get_setting(chat_id, "upvotes")
 
 
 async def set_upvotes(chat_id: int, mode: int):
-    count[chat_id] = mode
-    await countdb.update_one(
-        {"chat_id": chat_id}, {"$set": {"mode": mode}}, upsert=True
-    )
+    await set_setting(chat_id, "upvotes", mode)
 
 
 async def is_autoend() -> bool:
-    chat_id = 1234
-    user = await autoenddb.find_one({"chat_id": chat_id})
-    if not user:
-        return False
-    return True
+    return (await _flags()).get("autoend", False)
 
 
 async def autoend_on():
-    chat_id = 1234
-    await autoenddb.insert_one({"chat_id": chat_id})
+    await autoenddb.update_one(
+        {"chat_id": 1234}, {"$set": {"chat_id": 1234}}, upsert=True
+    )
+    await _set_flag("autoend", True)
 
 
 async def autoend_off():
-    chat_id = 1234
-    await autoenddb.delete_one({"chat_id": chat_id})
+    await autoenddb.delete_many({"chat_id": 1234})
+    await _set_flag("autoend", False)
 
 
 async def get_loop(chat_id: int) -> int:
@@ -292,76 +388,35 @@ async def set_loop(chat_id: int, mode: int):
 
 
 async def get_cmode(chat_id: int) -> int:
-    mode = channelconnect.get(chat_id)
-    if not mode:
-        mode = await channeldb.find_one({"chat_id": chat_id})
-        if not mode:
-            return None
-        channelconnect[chat_id] = mode["mode"]
-        return mode["mode"]
-    return mode
+    return await get_setting(chat_id, "cmode")
 
 
 async def set_cmode(chat_id: int, mode: int):
-    channelconnect[chat_id] = mode
-    await channeldb.update_one(
-        {"chat_id": chat_id}, {"$set": {"mode": mode}}, upsert=True
-    )
+    await set_setting(chat_id, "cmode", mode)
 
 
 async def get_playtype(chat_id: int) -> str:
-    mode = playtype.get(chat_id)
-    if not mode:
-        mode = await playtypedb.find_one({"chat_id": chat_id})
-        if not mode:
-            playtype[chat_id] = "Everyone"
-            return "Everyone"
-        playtype[chat_id] = mode["mode"]
-        return mode["mode"]
-    return mode
+    return await get_setting(chat_id, "playtype")
 
 
 async def set_playtype(chat_id: int, mode: str):
-    playtype[chat_id] = mode
-    await playtypedb.update_one(
-        {"chat_id": chat_id}, {"$set": {"mode": mode}}, upsert=True
-    )
+    await set_setting(chat_id, "playtype", mode)
 
 
 async def get_playmode(chat_id: int) -> str:
-    mode = playmode.get(chat_id)
-    if not mode:
-        mode = await playmodedb.find_one({"chat_id": chat_id})
-        if not mode:
-            playmode[chat_id] = "Direct"
-            return "Direct"
-        playmode[chat_id] = mode["mode"]
-        return mode["mode"]
-    return mode
+    return await get_setting(chat_id, "playmode")
 
 
 async def set_playmode(chat_id: int, mode: str):
-    playmode[chat_id] = mode
-    await playmodedb.update_one(
-        {"chat_id": chat_id}, {"$set": {"mode": mode}}, upsert=True
-    )
+    await set_setting(chat_id, "playmode", mode)
 
 
 async def get_lang(chat_id: int) -> str:
-    mode = langm.get(chat_id)
-    if not mode:
-        lang = await langdb.find_one({"chat_id": chat_id})
-        if not lang:
-            langm[chat_id] = "en"
-            return "en"
-        langm[chat_id] = lang["lang"]
-        return lang["lang"]
-    return mode
+    return await get_setting(chat_id, "lang")
 
 
 async def set_lang(chat_id: int, lang: str):
-    langm[chat_id] = lang
-    await langdb.update_one({"chat_id": chat_id}, {"$set": {"lang": lang}}, upsert=True)
+    await set_setting(chat_id, "lang", lang)
 
 
 async def is_music_playing(chat_id: int) -> bool:
@@ -438,98 +493,279 @@ async def remove_active_video_chat(chat_id: int):
 
 
 async def check_nonadmin_chat(chat_id: int) -> bool:
-    user = await authdb.find_one({"chat_id": chat_id})
-    if not user:
-        return False
-    return True
+    return await get_setting(chat_id, "nonadmin")
 
 
 async def is_nonadmin_chat(chat_id: int) -> bool:
-    mode = nonadmin.get(chat_id)
-    if not mode:
-        user = await authdb.find_one({"chat_id": chat_id})
-        if not user:
-            nonadmin[chat_id] = False
-            return False
-        nonadmin[chat_id] = True
-        return True
-    return mode
+    return await get_setting(chat_id, "nonadmin")
 
 
 async def add_nonadmin_chat(chat_id: int):
-    nonadmin[chat_id] = True
-    is_admin = await check_nonadmin_chat(chat_id)
-    if is_admin:
-        return
-    return await authdb.insert_one({"chat_id": chat_id})
+    await set_setting(chat_id, "nonadmin", True)
 
 
 async def remove_nonadmin_chat(chat_id: int):
-    nonadmin[chat_id] = False
-    is_admin = await check_nonadmin_chat(chat_id)
-    if not is_admin:
-        return
-    return await authdb.delete_one({"chat_id": chat_id})
+    await set_setting(chat_id, "nonadmin", False)
+
+
+# --------------------
+# Global flags
+# --------------------
+# on_off number or "autoend" -> bool, every process reloads them when the
+# version stamp in flagsdb moves
+flags = {}
+flags_version = None
+flags_watcher = None
+
+
+async def _load_flags():
+    global flags_version
+    stamp = await flagsdb.find_one({"_id": "flags"})
+    loaded = {item["on_off"]: True async for item in onoffdb.find({}, {"_id": 0})}
+    loaded["autoend"] = bool(await autoenddb.find_one({"chat_id": 1234}))
+    flags.clear()
+    flags.update(loaded)
+    flags_version = stamp["version"] if stamp else 0
+
+
+async def _flags() -> dict:
+    if flags_version is None:
+        await _load_flags()
+    return flags
+
+
+async def _set_flag(key, value: bool):
+    global flags_version
+    flags[key] = value
+    stamp = await flagsdb.find_one_and_update(
+        {"_id": "flags"},
+        {"$inc": {"version": 1}},
+        upsert=True,
+        return_document=ReturnDocument.AFTER,
+    )
+    flags_version = stamp["version"]
+
+
+async def _watch_flags():
+    while not await asyncio.sleep(config.FLAGS_POLL_INTERVAL):
+        try:
+            stamp = await flagsdb.find_one({"_id": "flags"})
+            if stamp and stamp["version"] != flags_version:
+                await _load_flags()
+        except Exception as e:
+            LOGGER(__name__).warning(f"Could not check global flags : {e}")
+
+
+async def load_flags():
+    global flags_watcher
+    await _load_flags()
+    if config.FLAGS_POLL_INTERVAL and flags_watcher is None:
+        flags_watcher = asyncio.create_task(_watch_flags())
 
 
 async def is_on_off(on_off: int) -> bool:
-    onoff = await onoffdb.find_one({"on_off": on_off})
-    if not onoff:
-        return False
-    return True
+    return (await _flags()).get(on_off, False)
 
 
 async def add_on(on_off: int):
-    is_on = await is_on_off(on_off)
-    if is_on:
-        return
-    return await onoffdb.insert_one({"on_off": on_off})
+    # the cached flag may be stale, let mongo decide whether it was there
+    await onoffdb.update_one(
+        {"on_off": on_off}, {"$set": {"on_off": on_off}}, upsert=True
+    )
+    await _set_flag(on_off, True)
 
 
 async def add_off(on_off: int):
-    is_off = await is_on_off(on_off)
-    if not is_off:
-        return
-    return await onoffdb.delete_one({"on_off": on_off})
+    await onoffdb.delete_one({"on_off": on_off})
+    await _set_flag(on_off, False)
 
 
 async def is_maintenance():
-    if not maintenance:
-        get = await onoffdb.find_one({"on_off": 1})
-        if not get:
-            maintenance.clear()
-            maintenance.append(2)
-            return True
-        else:
-            maintenance.clear()
-            maintenance.append(1)
-            return False
-    else:
-        if 1 in maintenance:
-            return False
-        else:
-            return True
+    return not await is_on_off(1)
 
 
 async def maintenance_off():
-    maintenance.clear()
-    maintenance.append(2)
-    is_off = await is_on_off(1)
-    if not is_off:
-        return
-    return await onoffdb.delete_one({"on_off": 1})
+    await add_off(1)
 
 
 async def maintenance_on():
-    maintenance.clear()
-    maintenance.append(1)
-    is_on = await is_on_off(1)
-    if is_on:
+    await add_on(1)
+
+
+# --------------------
+# Served users and chats
+# --------------------
+SERVED = {
+    "users": (usersdb, ("user_id",)),
+    "chats": (chatsdb, ("chat_id",)),
+    "private": (privatedb, ("chat_id",)),
+    "users_clone": (usersdbc, ("user_id", "bot_id")),
+    "chats_clone": (chatsdbc, ("chat_id", "bot_id")),
+}
+# kind -> ids (or (id, bot_id) pairs) known to be stored, and the ones that
+# still have to be written
+served = {kind: set() for kind in SERVED}
+unwritten = {kind: set() for kind in SERVED}
+served_writer = None
+
+
+def _flush_later():
+    global served_writer
+    if (
+        served_writer is None
+        or served_writer.done()
+        or served_writer is asyncio.current_task()
+    ):
+        served_writer = asyncio.create_task(_flush_served_later())
+
+
+async def _serve(kind, *ids):
+    key = ids if len(ids) > 1 else ids[0]
+    if key in served[kind]:
         return
-    return await onoffdb.insert_one({"on_off": 1})
+    served[kind].add(key)
+    unwritten[kind].add(key)
+    if sum(len(keys) for keys in unwritten.values()) >= config.SERVED_FLUSH_SIZE:
+        # written in the background, the handler does not wait for mongo
+        asyncio.create_task(flush_served())
+    else:
+        _flush_later()
+
+
+async def _flush_served_later():
+    await asyncio.sleep(config.SERVED_FLUSH_INTERVAL / 1000)
+    await flush_served()
+
+
+async def flush_served():
+    for kind, (collection, fields) in SERVED.items():
+        keys = list(unwritten[kind])
+        if not keys:
+            continue
+        unwritten[kind] = set()
+        docs = [
+            dict(zip(fields, key if isinstance(key, tuple) else (key,)))
+            for key in keys
+        ]
+        try:
+            await collection.bulk_write(
+                [UpdateOne(doc, {"$setOnInsert": doc}, upsert=True) for doc in docs],
+                ordered=False,
+            )
+        except BulkWriteError as e:
+            # another process upserting the same id at once is a duplicate key
+            errors = [
+                error for error in e.details["writeErrors"] if error["code"] != 11000
+            ]
+            if errors:
+                LOGGER(__name__).warning(f"Could not save {len(errors)} served {kind}")
+                # retried, and seen as new again until one of the tries works
+                failed = {keys[error["index"]] for error in errors}
+                served[kind].update(set(keys) - failed)
+                served[kind] -= failed
+                unwritten[kind] |= failed
+                _flush_later()
+        except Exception as e:
+            LOGGER(__name__).warning(f"Could not save served {kind} : {e}")
+            unwritten[kind].update(keys)
+            _flush_later()
+        else:
+            served[kind].update(keys)
+
+
+async def load_served():
+    """Remember every served user and chat so known ids never hit the database."""
+    for kind, (collection, fields) in SERVED.items():
+        projection = dict.fromkeys(fields, 1)
+        projection["_id"] = 0
+        async for doc in collection.find({}, projection):
+            if all(field in doc for field in fields):
+                ids = tuple(doc[field] for field in fields)
+                served[kind].add(ids if len(ids) > 1 else ids[0])
+    LOGGER(__name__).info(
+        f"Loaded {len(served['users'])} served users and {len(served['chats'])} served chats"
+    )
+
+
+async def iter_ids(collection, query: dict, field: str):
+    """Yield the ``field`` of every matching document, a batch at a time.
+
+    Every batch is a fresh query continuing after the last id, so a long
+    broadcast never holds a cursor open while it sleeps on a FloodWait."""
+    last = None
+    while True:
+        page = dict(query)
+        if last is not None:
+            page[field] = dict(query.get(field, {}), **{"$gt": last})
+        batch = [
+            doc[field]
+            async for doc in collection.find(page, {"_id": 0, field: 1})
+            .sort(field, 1)
+            .limit(config.DB_BATCH_SIZE)
+        ]
+        for item in batch:
+            yield item
+        if len(batch) < config.DB_BATCH_SIZE:
+            return
+        last = batch[-1]
+
+
+# (collection name, query) -> (expires, count)
+counts = {}
+
+
+async def _count(collection, query: dict) -> int:
+    key = (collection.name, repr(query))
+    item = counts.get(key)
+    if item and item[0] > time.monotonic():
+        return item[1]
+    if query:
+        value = await collection.count_documents(query)
+    else:
+        value = await collection.estimated_document_count()
+    counts[key] = (time.monotonic() + config.COUNT_CACHE_TTL, value)
+    return value
+
+
+def iter_served_chats():
+    return iter_ids(chatsdb, {"chat_id": {"$lt": 0}}, "chat_id")
+
+
+def iter_served_users():
+    return iter_ids(usersdb, {"user_id": {"$gt": 0}}, "user_id")
+
+
+def iter_private_served_chats():
+    return iter_ids(privatedb, {"chat_id": {"$lt": 0}}, "chat_id")
+
+
+def iter_served_chats_clone(bot_id: int):
+    return iter_ids(chatsdbc, {"bot_id": bot_id}, "chat_id")
+
+
+def iter_served_users_clone(bot_id: int):
+    return iter_ids(usersdbc, {"bot_id": bot_id}, "user_id")
+
+
+async def count_served_chats() -> int:
+    return await _count(chatsdb, {"chat_id": {"$lt": 0}})
+
+
+async def count_served_users() -> int:
+    return await _count(usersdb, {"user_id": {"$gt": 0}})
+
+
+async def count_served_chats_clone(bot_id: int) -> int:
+    return await _count(chatsdbc, {"bot_id": bot_id})
+
+
+async def count_served_users_clone(bot_id: int) -> int:
+    return await _count(usersdbc, {"bot_id": bot_id})
 
 
 async def is_served_user(user_id: int) -> bool:
+    if user_id in served["users"]:
+        return True
     user = await usersdb.find_one({"user_id": user_id})
     if not user:
         return False
@@ -538,26 +774,25 @@ async def is_served_user(user_id: int) -> bool:
 
 async def get_served_users() -> list:
     users_list = []
-    async for user in usersdb.find({"user_id": {"$gt": 0}}):
+    async for user in usersdb.find({"user_id": {"$gt": 0}}, {"_id": 0, "user_id": 1}):
         users_list.append(user)
     return users_list
 
 
 async def add_served_user(user_id: int):
-    is_served = await is_served_user(user_id)
-    if is_served:
-        return
-    return await usersdb.insert_one({"user_id": user_id})
+    await _serve("users", user_id)
 
 
 async def get_served_chats() -> list:
     chats_list = []
-    async for chat in chatsdb.find({"chat_id": {"$lt": 0}}):
+    async for chat in chatsdb.find({"chat_id": {"$lt": 0}}, {"_id": 0, "chat_id": 1}):
         chats_list.append(chat)
     return chats_list
 
 
 async def is_served_chat(chat_id: int) -> bool:
+    if chat_id in served["chats"]:
+        return True
     chat = await chatsdb.find_one({"chat_id": chat_id})
     if not chat:
         return False
@@ -565,20 +800,19 @@ async def is_served_chat(chat_id: int) -> bool:
 
 
 async def add_served_chat(chat_id: int):
-    is_served = await is_served_chat(chat_id)
-    if is_served:
-        return
-    return await chatsdb.insert_one({"chat_id": chat_id})
+    await _serve("chats", chat_id)
 
 
 async def delete_served_chat(chat_id: int):
+    served["chats"].discard(chat_id)
+    unwritten["chats"].discard(chat_id)
     await chatsdb.delete_one({"chat_id": chat_id})
 
 
 async def blacklisted_chats() -> list:
     chats_list = []
-    async for chat in blacklist_chatdb.find({"chat_id": {"$lt": 0}}):
-        chats_list.append(chat["chat_id"])
+    async for chat_id in iter_ids(blacklist_chatdb, {"chat_id": {"$lt": 0}}, "chat_id"):
+        chats_list.append(chat_id)
     return chats_list
 
 
@@ -645,8 +879,7 @@ async def delete_authuser(chat_id: int, name: str) -> bool:
 
 async def get_gbanned() -> list:
     results = []
-    async for user in gbansdb.find({"user_id": {"$gt": 0}}):
-        user_id = user["user_id"]
+    async for user_id in iter_ids(gbansdb, {"user_id": {"$gt": 0}}, "user_id"):
         results.append(user_id)
     return results
 
@@ -699,16 +932,13 @@ async def remove_sudo(user_id: int) -> bool:
 
 async def get_banned_users() -> list:
     results = []
-    async for user in blockeddb.find({"user_id": {"$gt": 0}}):
-        user_id = user["user_id"]
+    async for user_id in iter_ids(blockeddb, {"user_id": {"$gt": 0}}, "user_id"):
         results.append(user_id)
     return results
 
 
 async def get_banned_count() -> int:
-    users = blockeddb.find({"user_id": {"$gt": 0}})
-    users = await users.to_list(length=100000)
-    return len(users)
+    return await blockeddb.count_documents({"user_id": {"$gt": 0}})
 
 
 async def is_banned_user(user_id: int) -> bool:
@@ -737,12 +967,14 @@ async def remove_banned_user(user_id: int):
 
 async def get_private_served_chats() -> list:
     chats_list = []
-    async for chat in privatedb.find({"chat_id": {"$lt": 0}}):
+    async for chat in privatedb.find({"chat_id": {"$lt": 0}}, {"_id": 0, "chat_id": 1}):
         chats_list.append(chat)
     return chats_list
 
 
 async def is_served_private_chat(chat_id: int) -> bool:
+    if chat_id in served["private"]:
+        return True
     chat = await privatedb.find_one({"chat_id": chat_id})
     if not chat:
         return False
@@ -750,46 +982,28 @@ async def is_served_private_chat(chat_id: int) -> bool:
 
 
 async def add_private_chat(chat_id: int):
-    is_served = await is_served_private_chat(chat_id)
-    if is_served:
-        return
-    return await privatedb.insert_one({"chat_id": chat_id})
+    await _serve("private", chat_id)
 
 
 async def remove_private_chat(chat_id: int):
-    is_served = await is_served_private_chat(chat_id)
-    if not is_served:
-        return
-    return await privatedb.delete_one({"chat_id": chat_id})
+    served["private"].discard(chat_id)
+    unwritten["private"].discard(chat_id)
+    await privatedb.delete_one({"chat_id": chat_id})
 
 
 # SUGGESTION
 
 
 async def is_suggestion(chat_id: int) -> bool:
-    mode = suggestion.get(chat_id)
-    if not mode:
-        user = await suggdb.find_one({"chat_id": chat_id})
-        if not user:
-            suggestion[chat_id] = True
-            return True
-        suggestion[chat_id] = False
-        return False
-    return mode
+    return await get_setting(chat_id, "suggestion")
 
 
 async def suggestion_on(chat_id: int):
-    suggestion[chat_id] = True
-    user = await suggdb.find_one({"chat_id": chat_id})
-    if user:
-        return await suggdb.delete_one({"chat_id": chat_id})
+    await set_setting(chat_id, "suggestion", True)
 
 
 async def suggestion_off(chat_id: int):
-    suggestion[chat_id] = False
-    user = await suggdb.find_one({"chat_id": chat_id})
-    if not user:
-        return await suggdb.insert_one({"chat_id": chat_id})
+    await set_setting(chat_id, "suggestion", False)
 
 
 # Clean Mode
@@ -812,21 +1026,34 @@ async def cleanmode_on(chat_id: int):
         pass
 
 async def add_served_user_clone(user_id: int, bot_id: int):
-    is_served = await usersdbc.find_one({"user_id": user_id, "bot_id": bot_id})
-    if not is_served:
-        await usersdbc.insert_one({"user_id": user_id, "bot_id": bot_id})
+    await _serve("users_clone", user_id, bot_id)
 
 
 async def get_served_users_clone(bot_id: int) -> list:
-    return [user async for user in usersdbc.find({"bot_id": bot_id})]
+    return [
+        user async for user in usersdbc.find({"bot_id": bot_id}, {"_id": 0, "user_id": 1})
+    ]
 
 
 async def add_served_chat_clone(chat_id: int, bot_id: int):
-    is_served = await chatsdbc.find_one({"chat_id": chat_id, "bot_id": bot_id})
-    if not is_served:
-        await chatsdbc.insert_one({"chat_id": chat_id, "bot_id": bot_id})
+    await _serve("chats_clone", chat_id, bot_id)
 
 
 async def get_served_chats_clone(bot_id: int) -> list:
-    return [chat async for chat in chatsdbc.find({"bot_id": bot_id})]
+    return [
+        chat async for chat in chatsdbc.find({"bot_id": bot_id}, {"_id": 0, "chat_id": 1})
+    ]
+
+
 
+async def get_yt_metadata(key: str) -> Union[dict, None]:
+    """The stored {"result", "date"} document of a metadata key."""
+    return await ytmetadb.find_one({"_id": key}, {"_id": 0})
+
+
+async def save_yt_metadata(keys: List[str], result: dict):
+    date = datetime.utcnow()
+    for key in keys:
+        await ytmetadb.update_one(
+            {"_id": key}, {"$set": {"result": result, "date": date}}, upsert=True
+        )
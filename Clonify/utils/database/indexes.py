@@ -0,0 +1,159 @@
+import asyncio
+
+from pymongo.collection import Collection
+from pymongo.cursor import Cursor
+from pymongo.errors import DuplicateKeyError, OperationFailure
+
+import config
+from Clonify.core.fileids import fileidsdb
+from Clonify.logging import LOGGER
+
+from .clonedb import clonebotdb, clonebotnamedb, cloneownerdb
+from .database import (
+    assdb,
+    authuserdb,
+    autoenddb,
+    blacklist_chatdb,
+    blockeddb,
+    chatsdb,
+    chatsdbc,
+    gbansdb,
+    onoffdb,
+    privatedb,
+    queriesdb,
+    settingsdb,
+    sudoersdb,
+    userdb,
+    usersdb,
+    usersdbc,
+    ytmetadb,
+)
+
+# (collection, keys, unique, extra options)
+INDEXES = [
+    (chatsdb, [("chat_id", 1)], True, {}),
+    (usersdb, [("user_id", 1)], True, {}),
+    (settingsdb, [("chat_id", 1)], True, {}),
+    (assdb, [("chat_id", 1)], True, {}),
+    (assdb, [("assistant", 1)], False, {}),
+    (authuserdb, [("chat_id", 1)], True, {}),
+    (blockeddb, [("user_id", 1)], True, {}),
+    (gbansdb, [("user_id", 1)], True, {}),
+    (sudoersdb, [("sudo", 1)], True, {}),
+    (privatedb, [("chat_id", 1)], True, {}),
+    (blacklist_chatdb, [("chat_id", 1)], True, {}),
+    (queriesdb, [("chat_id", 1)], True, {}),
+    (userdb, [("chat_id", 1)], True, {}),
+    (onoffdb, [("on_off", 1)], True, {}),
+    (autoenddb, [("chat_id", 1)], False, {}),
+    (chatsdbc, [("chat_id", 1), ("bot_id", 1)], True, {}),
+    # per-clone broadcasts and stats page through one bot's ids in order
+    (chatsdbc, [("bot_id", 1), ("chat_id", 1)], False, {}),
+    (usersdbc, [("user_id", 1), ("bot_id", 1)], True, {}),
+    (usersdbc, [("bot_id", 1), ("user_id", 1)], False, {}),
+    (clonebotdb, [("bot_id", 1)], True, {}),
+    (clonebotdb, [("user_id", 1)], False, {}),
+    (clonebotdb, [("token", 1)], True, {}),
+    (clonebotdb, [("username", 1)], False, {}),
+    (cloneownerdb, [("bot_id", 1)], False, {}),
+    (clonebotnamedb, [("bot_id", 1)], False, {}),
+    (fileidsdb, [("bot", 1), ("key", 1)], True, {}),
+    (ytmetadb, [("date", 1)], False, {"expireAfterSeconds": config.YT_META_TTL}),
+]
+
+# (collection, filter[, sort]) of the lookups that run on every update or page
+# through a whole collection
+HOT_QUERIES = [
+    (chatsdb, {"chat_id": 0}),
+    (usersdb, {"user_id": 0}),
+    (settingsdb, {"chat_id": 0}),
+    (assdb, {"chat_id": 0}),
+    (authuserdb, {"chat_id": 0}),
+    (blockeddb, {"user_id": 0}),
+    (gbansdb, {"user_id": 0}),
+    (chatsdbc, {"chat_id": 0, "bot_id": 0}),
+    (usersdbc, {"user_id": 0, "bot_id": 0}),
+    (chatsdbc, {"bot_id": 0}, [("chat_id", 1)]),
+    (usersdbc, {"bot_id": 0}, [("user_id", 1)]),
+    (clonebotdb, {"bot_id": 0}),
+    (clonebotdb, {"user_id": 0}),
+    (clonebotdb, {"token": ""}),
+    (clonebotdb, {"username": ""}),
+]
+
+
+async def _call(target, method, *args, **kwargs):
+    # clonebotdb is a blocking pymongo collection, keep it off the event loop
+    func = getattr(target, method)
+    if isinstance(target, (Collection, Cursor)):
+        return await asyncio.to_thread(func, *args, **kwargs)
+    return await func(*args, **kwargs)
+
+
+async def _create(collection, keys, unique, options):
+    name = "_".join(f"{key}_{order}" for key, order in keys)
+    try:
+        await _call(collection, "create_index", keys, unique=unique, **options)
+        return
+    except DuplicateKeyError:
+        LOGGER(__name__).warning(
+            f"{collection.name} has duplicate {name} entries, indexing it without a unique constraint"
+        )
+    except OperationFailure as e:
+        # 11000 is a duplicate key, anything else is an existing index that
+        # was built with other options and is left alone
+        if e.code != 11000:
+            LOGGER(__name__).warning(f"Kept the existing {collection.name}.{name} index : {e}")
+            return
+        LOGGER(__name__).warning(
+            f"{collection.name} has duplicate {name} entries, indexing it without a unique constraint"
+        )
+    await _call(collection, "create_index", keys, **options)
+
+
+async def ensure_indexes():
+    """Create every index the bot relies on, safe to run on each boot."""
+    for collection, keys, unique, options in INDEXES:
+        try:
+            await _create(collection, keys, unique, options)
+        except Exception as e:
+            LOGGER(__name__).warning(f"Could not index {collection.name} : {e}")
+
+
+def _stages(plan):
+    yield plan.get("stage")
+    for child in [plan.get("inputStage")] + plan.get("inputStages", []):
+        if child:
+            yield from _stages(child)
+
+
+async def explain_report():
+    """Log the hot lookups that do not use an index."""
+    slow = 0
+    for collection, query, *sort in HOT_QUERIES:
+        try:
+            cursor = collection.find(query)
+            if sort:
+                cursor = cursor.sort(sort[0])
+            cursor = cursor.limit(1)
+            plan = await _call(cursor, "explain")
+        except Exception as e:
+            LOGGER(__name__).warning(f"Could not explain {collection.name} {query} : {e}")
+            continue
+        winning = plan.get("queryPlanner", {}).get("winningPlan", {})
+        winning = winning.get("queryPlan", winning)
+        stages = set(_stages(winning))
+        if "COLLSCAN" in stages:
+            slow += 1
+            examined = plan.get("executionStats", {}).get("totalDocsExamined", "?")
+            LOGGER(__name__).warning(
+                f"{collection.name}.find({list(query)}) is a collection scan, {examined} documents examined"
+            )
+        elif "SORT" in stages:
+            slow += 1
+            LOGGER(__name__).warning(
+                f"{collection.name}.find({list(query)}) is sorted in memory"
+            )
+    LOGGER(__name__).info(
+        f"Checked {len(HOT_QUERIES)} hot queries, {slow} without an index"
+    )
@@ -13,9 +13,10 @@ from Clonify.utils.database import (
     is_nonadmin_chat,
     is_skipmode,
 )
-from config import SUPPORT_CHAT, adminlist, confirmer
+from config import SUPPORT_CHAT, confirmer
 from strings import get_string
 
+from ..admincache import get_admins
 from ..formatters import int_to_alpha
 
 # Zeo
@@ -66,7 +67,7 @@ def AdminRightsCheck(mystic):
         is_non_admin = await is_nonadmin_chat(message.chat.id)
         if not is_non_admin:
             if message.from_user.id not in SUDOERS:
-                admins = adminlist.get(message.chat.id)
+                admins = await get_admins(client, message.chat.id)
                 if not admins:
                     return await message.reply_text(_["admin_13"])
                 else:
@@ -11,6 +11,7 @@ from pyrogram.types import InlineKeyboardButton, InlineKeyboardMarkup
 
 from Clonify import YouTube, app
 from Clonify.misc import SUDOERS
+from Clonify.utils.admincache import get_admins
 from Clonify.utils.database import (
     get_assistant,
     get_cmode,
@@ -21,7 +22,7 @@ from Clonify.utils.database import (
     is_maintenance,
 )
 from Clonify.utils.inline import botplaylist_markup
-from config import PLAYLIST_IMG_URL, SUPPORT_CHAT, adminlist
+from config import PLAYLIST_IMG_URL, SUPPORT_CHAT
 from strings import get_string
 
 links = {}
@@ -94,7 +95,7 @@ def PlayWrapper(command):
         playty = await get_playtype(message.chat.id)
         if playty != "Everyone":
             if message.from_user.id not in SUDOERS:
-                admins = adminlist.get(message.chat.id)
+                admins = await get_admins(client, message.chat.id)
                 if not admins:
                     return await message.reply_text(_["admin_13"])
                 else:
@@ -197,7 +198,7 @@ def PlayWrapper(command):
 
 def CPlayWrapper(command):
     async def wrapper(client, message):
-        i = await client.get_me()
+        i = client.me
         language = await get_lang(message.chat.id)
         _ = get_string(language)
         if message.sender_chat:
@@ -262,7 +263,7 @@ def CPlayWrapper(command):
         playty = await get_playtype(message.chat.id)
         if playty != "Everyone":
             if message.from_user.id not in SUDOERS:
-                admins = adminlist.get(message.chat.id)
+                admins = await get_admins(client, message.chat.id)
                 if not admins:
                     return await message.reply_text(_["admin_13"])
                 else:
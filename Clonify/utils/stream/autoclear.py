@@ -1,18 +1,11 @@
-import os
-
-from config import autoclean
+from Clonify.utils.stream.mediacache import evict, touch
 
 
 async def auto_clean(popped):
     try:
-        rem = popped["file"]
-        autoclean.remove(rem)
-        count = autoclean.count(rem)
-        if count == 0:
-            if "vid_" not in rem or "live_" not in rem or "index_" not in rem:
-                try:
-                    os.remove(rem)
-                except:
-                    pass
+        for file in (popped["file"], popped.get("prefetched")):
+            if file:
+                touch(file)
+        evict()
     except:
         pass
@@ -0,0 +1,242 @@
+import asyncio
+import json
+import os
+import time
+
+import config
+from Clonify.logging import LOGGER
+from Clonify.misc import db
+
+DOWNLOADS = os.path.realpath("downloads")
+INDEX = os.path.join(DOWNLOADS, ".index.json")
+# streamed downloads are written without a .part file, the ones still being
+# written are listed here so a restart knows which files were cut off
+GROWING = os.path.join(DOWNLOADS, ".growing.json")
+
+# realpath -> {"size", "last", "hits", "video"}
+index = {}
+# (video id, video) -> realpath, so a lookup does not go over the index
+by_video = {}
+# realpath -> download job still writing it
+growing = {}
+# realpath of streamed downloads that failed while a queue was playing them
+broken = set()
+
+
+def _path(file) -> str:
+    path = os.path.realpath(str(file))
+    if os.path.dirname(path) == DOWNLOADS and os.path.isfile(path):
+        return path
+
+
+dirty = False
+
+
+def _key(path, item):
+    return os.path.basename(path).split(".")[0], item["video"]
+
+
+def _save():
+    # written by flusher() or flush(), not on every hit
+    global dirty
+    dirty = True
+
+
+def _write(data):
+    try:
+        with open(INDEX + ".tmp", "w") as f:
+            f.write(data)
+        os.replace(INDEX + ".tmp", INDEX)
+    except Exception as e:
+        LOGGER(__name__).warning(f"Could not save media cache index : {e}")
+
+
+def flush():
+    global dirty
+    if dirty:
+        dirty = False
+        _write(json.dumps(index))
+
+
+async def flusher():
+    global dirty
+    while not await asyncio.sleep(config.MEDIA_INDEX_FLUSH_INTERVAL):
+        if dirty:
+            dirty = False
+            await asyncio.to_thread(_write, json.dumps(index))
+
+
+def _write_growing():
+    try:
+        with open(GROWING, "w") as f:
+            json.dump(list(growing), f)
+    except Exception as e:
+        LOGGER(__name__).warning(f"Could not save growing downloads : {e}")
+
+
+def grow(path, job):
+    growing[path] = job
+    _write_growing()
+
+
+def settle(path):
+    if growing.pop(path, None):
+        _write_growing()
+
+
+def _forget(path):
+    item = index.pop(path)
+    key = _key(path, item)
+    if by_video.get(key) == path:
+        by_video.pop(key)
+    return item
+
+
+def load():
+    try:
+        with open(INDEX) as f:
+            index.update(json.load(f))
+    except:
+        pass
+    for path in list(index):
+        if not os.path.isfile(path):
+            index.pop(path)
+    try:
+        with open(GROWING) as f:
+            cut = set(json.load(f))
+    except:
+        cut = set()
+    for name in os.listdir(DOWNLOADS):
+        path = _path(os.path.join(DOWNLOADS, name))
+        if not path or name.startswith(".") or path in index:
+            continue
+        if path in cut or name.endswith((".part", ".ytdl")):
+            # cut off mid-download
+            try:
+                os.remove(path)
+            except:
+                pass
+            continue
+        # finished before the index was saved, or before there was one
+        index[path] = {
+            "size": os.path.getsize(path),
+            "last": os.path.getmtime(path),
+            "hits": 0,
+            "video": path.endswith(".mp4"),
+        }
+    for path in cut:
+        if index.pop(path, None):
+            try:
+                os.remove(path)
+            except:
+                pass
+    for path, item in index.items():
+        by_video[_key(path, item)] = path
+    _write_growing()
+    _save()
+    flush()
+    evict()
+
+
+def pinned() -> set:
+    pins = set()
+    for queue in list(db.values()):
+        for entry in queue:
+            for file in (entry.get("file"), entry.get("prefetched")):
+                path = file and _path(file)
+                if path:
+                    pins.add(path)
+    return pins
+
+
+def discard(path):
+    """Delete a failed download, or once no queue plays it anymore."""
+    if path in pinned():
+        broken.add(path)
+        return
+    try:
+        os.remove(path)
+    except:
+        pass
+
+
+def sweep():
+    if not broken:
+        return
+    pins = pinned()
+    for path in list(broken):
+        if path in pins:
+            continue
+        broken.discard(path)
+        try:
+            os.remove(path)
+        except:
+            pass
+
+
+def evict():
+    sweep()
+    budget = config.MEDIA_CACHE_SIZE * 1024 * 1024
+    total = sum(item["size"] for item in index.values())
+    if total <= budget:
+        return
+    pins = pinned()
+    evicted = False
+    # least recently used first, the more often played ones last among equals
+    for path in sorted(index, key=lambda p: (index[p]["last"], index[p]["hits"])):
+        if total <= budget:
+            break
+        if path in pins:
+            continue
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            LOGGER(__name__).warning(f"Could not evict {path} : {e}")
+            continue
+        total -= _forget(path)["size"]
+        evicted = True
+    if evicted:
+        _save()
+
+
+def touch(file, video=None):
+    path = _path(file)
+    if not path or path in growing or path in broken:
+        return
+    item = index.get(path)
+    if item:
+        item["last"] = time.time()
+        item["hits"] += 1
+        _save()
+        return
+    item = index[path] = {
+        "size": os.path.getsize(path),
+        "last": time.time(),
+        "hits": 0,
+        "video": bool(video) if video is not None else path.endswith(".mp4"),
+    }
+    by_video[_key(path, item)] = path
+    _save()
+    evict()
+
+
+def lookup(vidid: str, video=None):
+    path = by_video.get((vidid, bool(video)))
+    if not path:
+        return None
+    if not os.path.isfile(path):
+        _forget(path)
+        _save()
+        return None
+    touch(path)
+    return path
+
+
+def follow_params(file) -> str:
+    """ffmpeg input options for reading a file that is still being downloaded."""
+    job = growing.get(os.path.realpath(str(file)))
+    if job and not job.done():
+        return f"-follow 1 -rw_timeout {config.STREAM_FOLLOW_TIMEOUT * 1000000}"
+    return ""
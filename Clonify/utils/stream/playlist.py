@@ -0,0 +1,58 @@
+import asyncio
+import time
+from collections import deque
+
+import config
+from Clonify import YouTube
+
+
+async def _details(search, videoid):
+    try:
+        return await YouTube.details(search, videoid)
+    except:
+        return None
+
+
+async def resolve_playlist(searches, videoid):
+    """Yield YouTube.details of every search in order, resolving a bounded
+    window of them concurrently so the first track is ready as soon as possible."""
+    searches = iter(searches)
+    pending = deque()
+
+    def fill():
+        while len(pending) < config.PLAYLIST_CONCURRENCY:
+            search = next(searches, None)
+            if search is None:
+                return
+            pending.append(asyncio.ensure_future(_details(search, videoid)))
+
+    fill()
+    try:
+        while pending:
+            task = pending.popleft()
+            fill()
+            yield await task
+    finally:
+        for task in pending:
+            task.cancel()
+
+
+class PlaylistProgress:
+    """Edits the query's progress message in place, at most every few seconds."""
+
+    def __init__(self, _, mystic, total):
+        self._ = _
+        self.mystic = mystic
+        self.total = total
+        self.last = 0
+
+    async def update(self, done, queued):
+        if not self.mystic or time.monotonic() - self.last < 3:
+            return
+        self.last = time.monotonic()
+        try:
+            await self.mystic.edit_text(
+                self._["play_23"].format(done, self.total, queued)
+            )
+        except:
+            pass
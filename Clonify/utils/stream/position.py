@@ -0,0 +1,34 @@
+import time
+
+# A queue entry keeps the position it had at "anchor" (a monotonic timestamp,
+# None while paused) in "offset", so the playback position is computed on read.
+
+
+def get_played(entry) -> int:
+    seconds = int(entry.get("seconds") or 0)
+    if not seconds:
+        return 0
+    played = entry.get("offset", 0)
+    if entry.get("anchor") is not None:
+        played += time.monotonic() - entry["anchor"]
+    return int(min(max(played, 0), seconds))
+
+
+def set_played(entry, seconds=0):
+    entry["offset"] = max(float(seconds), 0)
+    entry["anchor"] = None if entry.get("paused") else time.monotonic()
+
+
+def pause_position(entry):
+    if entry.get("paused"):
+        return
+    entry["offset"] = get_played(entry)
+    entry["anchor"] = None
+    entry["paused"] = True
+
+
+def resume_position(entry):
+    if not entry.get("paused"):
+        return
+    entry["paused"] = False
+    entry["anchor"] = time.monotonic()
@@ -0,0 +1,67 @@
+import asyncio
+
+import config
+from Clonify import YouTube
+from Clonify.logging import LOGGER
+from Clonify.misc import db
+
+prefetching = {}
+
+
+def _pending(chat_id, failed=()):
+    queue = db.get(chat_id) or []
+    for entry in queue[1 : config.PREFETCH_DEPTH + 1]:
+        if id(entry) in failed:
+            continue
+        if "vid_" in str(entry.get("file")) and not entry.get("prefetched"):
+            return entry
+
+
+async def _prefetch(chat_id):
+    failed = set()
+    while True:
+        entry = _pending(chat_id, failed)
+        if not entry:
+            break
+        video = True if str(entry["streamtype"]) == "video" else None
+        try:
+            file_path, direct = await YouTube.download(
+                entry["vidid"], None, videoid=True, video=video
+            )
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            LOGGER(__name__).warning(
+                f"Prefetch of {entry['vidid']} in {chat_id} failed : {type(e).__name__}"
+            )
+            failed.add(id(entry))
+            continue
+        if not file_path or not direct:
+            # a stream url can expire before the track comes up, only a file
+            # on disk is worth keeping
+            failed.add(id(entry))
+            continue
+        entry["prefetched"] = file_path
+    prefetching.pop(chat_id, None)
+
+
+def prefetch(chat_id):
+    if config.PREFETCH_DEPTH < 1:
+        return
+    task = prefetching.get(chat_id)
+    if task and not task.done():
+        return
+    if not _pending(chat_id):
+        return
+    prefetching[chat_id] = asyncio.create_task(_prefetch(chat_id))
+
+
+def cancel_prefetch(chat_id):
+    task = prefetching.pop(chat_id, None)
+    if task and not task.done():
+        task.cancel()
+
+
+def restart_prefetch(chat_id):
+    cancel_prefetch(chat_id)
+    prefetch(chat_id)
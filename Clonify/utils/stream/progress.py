@@ -0,0 +1,113 @@
+import asyncio
+import random
+import time
+from collections import deque
+
+from pyrogram.errors import FloodWait, MessageIdInvalid, MessageNotModified
+from pyrogram.types import InlineKeyboardMarkup
+
+import config
+from Clonify.misc import db
+from Clonify.utils.database import get_lang, is_music_playing
+from Clonify.utils.formatters import seconds_to_min
+from Clonify.utils.inline import stream_markup_timer
+from Clonify.utils.stream.position import get_played
+from strings import get_string
+
+# chat_id -> (message id, bar, elapsed time) of the last progress markup sent
+rendered = {}
+# bot id -> monotonic time until which it is in a FloodWait
+flooded = {}
+# bot id -> {"edits", "skipped", "failed", "floodwaits"} and recent edit times
+edit_stats = {}
+edit_times = {}
+updating = set()
+
+
+def _stats(bot_id):
+    if bot_id not in edit_stats:
+        edit_stats[bot_id] = {"edits": 0, "skipped": 0, "failed": 0, "floodwaits": 0}
+        edit_times[bot_id] = deque()
+    return edit_stats[bot_id]
+
+
+def edit_rate(bot_id) -> int:
+    """Edits made by a bot during the last minute."""
+    times = edit_times.get(bot_id) or deque()
+    while times and times[0] < time.monotonic() - 60:
+        times.popleft()
+    return len(times)
+
+
+async def _update(chat_id, delay, semaphore):
+    await asyncio.sleep(delay)
+    playing = db.get(chat_id)
+    if not playing or not await is_music_playing(chat_id):
+        return
+    mystic = playing[0].get("mystic")
+    duration_seconds = int(playing[0]["seconds"])
+    if not mystic or duration_seconds == 0:
+        return
+    bot_id = mystic._client.me.id
+    stats = _stats(bot_id)
+    if flooded.get(bot_id, 0) > time.monotonic():
+        stats["skipped"] += 1
+        return
+    try:
+        language = await get_lang(chat_id)
+        _ = get_string(language)
+    except:
+        _ = get_string("en")
+    played = seconds_to_min(get_played(playing[0]))
+    buttons = stream_markup_timer(_, chat_id, played, playing[0]["dur"])
+    # the button shows the elapsed time next to the bar, it only stays the
+    # same while the stream is stuck
+    shown = (mystic.id, buttons[0][0].text.split(" ")[1], played)
+    if rendered.get(chat_id) in (shown, (mystic.id, None, None)):
+        stats["skipped"] += 1
+        return
+    async with semaphore:
+        try:
+            await mystic.edit_reply_markup(reply_markup=InlineKeyboardMarkup(buttons))
+        except FloodWait as e:
+            flooded[bot_id] = time.monotonic() + e.value
+            stats["floodwaits"] += 1
+            return
+        except MessageNotModified:
+            pass
+        except MessageIdInvalid:
+            # the card is gone, do not retry it until the next track
+            rendered[chat_id] = (mystic.id, None, None)
+            stats["failed"] += 1
+            return
+        except Exception:
+            stats["failed"] += 1
+            return
+    rendered[chat_id] = shown
+    stats["edits"] += 1
+    edit_times[bot_id].append(time.monotonic())
+
+
+def _done(chat_id, task):
+    updating.discard(chat_id)
+    if not task.cancelled():
+        task.exception()
+
+
+async def progress_updater():
+    """Refresh the progress bar of every playing card once per interval.
+
+    Each chat gets a random offset inside the interval so the edits are spread
+    out, and an edit is only sent when what the button shows changed."""
+    semaphore = asyncio.Semaphore(config.PROGRESS_CONCURRENCY)
+    while not await asyncio.sleep(config.PROGRESS_INTERVAL):
+        for chat_id in list(rendered):
+            if chat_id not in db:
+                rendered.pop(chat_id, None)
+        for chat_id, queue in list(db.items()):
+            if chat_id in updating or not queue or not queue[0].get("mystic"):
+                continue
+            updating.add(chat_id)
+            delay = random.uniform(0, config.PROGRESS_INTERVAL)
+            task = asyncio.create_task(_update(chat_id, delay, semaphore))
+            task.add_done_callback(lambda t, c=chat_id: _done(c, t))
@@ -3,7 +3,10 @@ from typing import Union
 
 from Clonify.misc import db
 from Clonify.utils.formatters import check_duration, seconds_to_min
-from config import autoclean, time_to_seconds
+from Clonify.utils.stream.mediacache import touch
+from Clonify.utils.stream.prefetch import prefetch
+from Clonify.utils.thumbnails import prerender
+from config import time_to_seconds
 
 
 async def put_queue(
@@ -17,6 +20,7 @@ async def put_queue(
     user_id,
     stream,
     forceplay: Union[bool, str] = None,
+    bot_id: int = None,
 ):
     title = title.title()
     try:
@@ -33,7 +37,8 @@ async def put_queue(
         "file": file,
         "vidid": vidid,
         "seconds": duration_in_seconds,
-        "played": 0,
+        # the clone that queued it, None for the main bot
+        "bot_id": bot_id,
     }
     if forceplay:
         check = db.get(chat_id)
@@ -44,7 +49,9 @@ async def put_queue(
             db[chat_id].append(put)
     else:
         db[chat_id].append(put)
-    autoclean.append(file)
+    touch(file)
+    prefetch(chat_id)
+    prerender(vidid)
 
 
 async def put_queue_index(
@@ -57,6 +64,7 @@ async def put_queue_index(
     vidid,
     stream,
     forceplay: Union[bool, str] = None,
+    bot_id: int = None,
 ):
     if "20.212.146.162" in vidid:
         try:
@@ -78,7 +86,7 @@ async def put_queue_index(
         "file": file,
         "vidid": vidid,
         "seconds": dur,
-        "played": 0,
+        "bot_id": bot_id,
     }
     if forceplay:
         check = db.get(chat_id)
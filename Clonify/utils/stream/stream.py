@@ -11,7 +11,9 @@ from Clonify.misc import db
 from Clonify.utils.database import add_active_video_chat, is_active_chat
 from Clonify.utils.exceptions import AssistantErr
 from Clonify.utils.inline import aq_markup, close_markup, stream_markup
+from Clonify.utils.stream.position import set_played
 from Clonify.utils.stream.queue import put_queue, put_queue_index
+from Clonify.utils.stream.playlist import PlaylistProgress, resolve_playlist
 from Clonify.utils.pastebin import PROBin
 from Clonify.utils.thumbnails import get_thumb
 
@@ -36,19 +38,16 @@ async def stream(
     if streamtype == "playlist":
         msg = f"{_['play_19']}\n\n"
         count = 0
-        for search in result:
+        resolved = 0
+        progress = PlaylistProgress(_, mystic, len(result))
+        async for details in resolve_playlist(result, False if spotify else True):
             if int(count) == config.PLAYLIST_FETCH_LIMIT:
+                break
+            resolved += 1
+            await progress.update(resolved, count)
+            if not details:
                 continue
-            try:
-                (
-                    title,
-                    duration_min,
-                    duration_sec,
-                    thumbnail,
-                    vidid,
-                ) = await YouTube.details(search, False if spotify else True)
-            except:
-                continue
+            title, duration_min, duration_sec, thumbnail, vidid = details
             if str(duration_min) == "None":
                 continue
             if duration_sec > config.DURATION_LIMIT:
@@ -98,6 +97,8 @@ async def stream(
                     "video" if video else "audio",
                     forceplay=forceplay,
                 )
+                # joined above, playback starts now
+                set_played(db[chat_id][0])
                 img = await get_thumb(vidid)
                 button = stream_markup(_, chat_id)
                 run = await app.send_photo(
@@ -184,6 +185,7 @@ async def stream(
                 "video" if video else "audio",
                 forceplay=forceplay,
             )
+            set_played(db[chat_id][0])
             img = await get_thumb(vidid)
             button = stream_markup(_, chat_id)
             run = await app.send_photo(
@@ -238,6 +240,7 @@ async def stream(
                 "audio",
                 forceplay=forceplay,
             )
+            set_played(db[chat_id][0])
             button = stream_markup(_, chat_id)
             run = await app.send_photo(
                 original_chat_id,
@@ -290,6 +293,7 @@ async def stream(
                 "video" if video else "audio",
                 forceplay=forceplay,
             )
+            set_played(db[chat_id][0])
             if video:
                 await add_active_video_chat(chat_id)
             button = stream_markup(_, chat_id)
@@ -352,6 +356,7 @@ async def stream(
                 "video" if video else "audio",
                 forceplay=forceplay,
             )
+            set_played(db[chat_id][0])
             img = await get_thumb(vidid)
             button = stream_markup(_, chat_id)
             run = await app.send_photo(
@@ -408,6 +413,7 @@ async def stream(
                 "video" if video else "audio",
                 forceplay=forceplay,
             )
+            set_played(db[chat_id][0])
             button = stream_markup(_, chat_id)
             run = await app.send_photo(
                 original_chat_id,
@@ -1,14 +1,21 @@
+import asyncio
+import multiprocessing
 import os
 import re
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 
 import aiofiles
 import aiohttp
 from PIL import Image, ImageDraw, ImageEnhance, ImageFilter, ImageFont
 from unidecode import unidecode
-from youtubesearchpython.__future__ import VideosSearch
+from Clonify.utils.ytmeta import search_one
 
 from Clonify import app
-from config import YOUTUBE_IMG_URL
+from Clonify.logging import LOGGER
+from config import THUMB_WORKERS, YOUTUBE_IMG_URL
 
 
 def changeImageSize(maxWidth, maxHeight, image):
@@ -29,14 +36,109 @@ def clear(text):
     return title.strip()
 
 
-async def get_thumb(videoid):
-    if os.path.isfile(f"cache/{videoid}.png"):
-        return f"cache/{videoid}.png"
+# fonts are loaded once per render worker
+_fonts = {}
+
+
+def _init_renderer():
+    _fonts["arial"] = ImageFont.truetype("Clonify/assets/font2.ttf", 30)
+    _fonts["font"] = ImageFont.truetype("Clonify/assets/font.ttf", 30)
+
+
+def _render(videoid, title, duration, views, channel):
+    arial = _fonts["arial"]
+    font = _fonts["font"]
+    youtube = Image.open(f"cache/thumb{videoid}.png")
+    image1 = changeImageSize(1280, 720, youtube)
+    image2 = image1.convert("RGBA")
+    background = image2.filter(filter=ImageFilter.BoxBlur(10))
+    enhancer = ImageEnhance.Brightness(background)
+    background = enhancer.enhance(0.5)
+    draw = ImageDraw.Draw(background)
+    text_size = draw.textsize("TEAM KRITI BOTS    ", font=font)
+    draw.text((1280 - text_size[0] - 10, 10), "TEAM KRITI BOTS    ", fill="yellow", font=font)
+    draw.text(
+        (55, 560),
+        f"{channel} | {views[:23]}",
+        (255, 255, 255),
+        font=arial,
+    )
+    draw.text(
+        (57, 600),
+        clear(title),
+        (255, 255, 255),
+        font=font,
+    )
+    draw.line(
+        [(55, 660), (1220, 660)],
+        fill="white",
+        width=5,
+        joint="curve",
+    )
+    draw.ellipse(
+        [(918, 648), (942, 672)],
+        outline="white",
+        fill="white",
+        width=15,
+    )
+    draw.text(
+        (36, 685),
+        "00:00",
+        (255, 255, 255),
+        font=arial,
+    )
+    draw.text(
+        (1185, 685),
+        f"{duration[:23]}",
+        (255, 255, 255),
+        font=arial,
+    )
+    try:
+        os.remove(f"cache/thumb{videoid}.png")
+    except:
+        pass
+    background.save(f"cache/{videoid}.png")
+    return f"cache/{videoid}.png"
+
+
+_renderer = None
+# videoid -> thumbnail being fetched and rendered
+rendering = {}
+render_times = deque(maxlen=100)
+
+
+def _pool() -> ProcessPoolExecutor:
+    global _renderer
+    if _renderer is None:
+        _renderer = ProcessPoolExecutor(
+            max_workers=THUMB_WORKERS,
+            mp_context=multiprocessing.get_context("fork"),
+            initializer=_init_renderer,
+        )
+    return _renderer
+
+
+def start():
+    """Fork the render workers before the bot starts any thread, see ytdlpool."""
+    _pool().submit(os.getpid).result()
+
+
+def _submit(*args):
+    global _renderer
+    try:
+        return _pool().submit(_render, *args)
+    except BrokenProcessPool:
+        # a worker died (out of memory, a crash in PIL), the pool is unusable
+        LOGGER(__name__).warning("Thumbnail render pool broke, starting a new one")
+        _renderer = None
+        return _pool().submit(_render, *args)
+
 
+async def _get_thumb(videoid):
     url = f"https://www.youtube.com/watch?v={videoid}"
     try:
-        results = VideosSearch(url, limit=1)
-        for result in (await results.next())["result"]:
+        result = await search_one(url)
+        if result:
             try:
                 title = result["title"]
                 title = re.sub("\W+", " ", title)
@@ -64,59 +166,38 @@ async def get_thumb(videoid):
                     await f.write(await resp.read())
                     await f.close()
 
-        youtube = Image.open(f"cache/thumb{videoid}.png")
-        image1 = changeImageSize(1280, 720, youtube)
-        image2 = image1.convert("RGBA")
-        background = image2.filter(filter=ImageFilter.BoxBlur(10))
-        enhancer = ImageEnhance.Brightness(background)
-        background = enhancer.enhance(0.5)
-        draw = ImageDraw.Draw(background)
-        arial = ImageFont.truetype("Clonify/assets/font2.ttf", 30)
-        font = ImageFont.truetype("Clonify/assets/font.ttf", 30)
-        text_size = draw.textsize("TEAM KRITI BOTS    ", font=font)
-        draw.text((1280 - text_size[0] - 10, 10), "TEAM KRITI BOTS    ", fill="yellow", font=font)
-        draw.text(
-            (55, 560),
-            f"{channel} | {views[:23]}",
-            (255, 255, 255),
-            font=arial,
-        )
-        draw.text(
-            (57, 600),
-            clear(title),
-            (255, 255, 255),
-            font=font,
-        )
-        draw.line(
-            [(55, 660), (1220, 660)],
-            fill="white",
-            width=5,
-            joint="curve",
-        )
-        draw.ellipse(
-            [(918, 648), (942, 672)],
-            outline="white",
-            fill="white",
-            width=15,
+        start = time.monotonic()
+        path = await asyncio.wrap_future(
+            _submit(videoid, title, str(duration), str(views), channel)
         )
-        draw.text(
-            (36, 685),
-            "00:00",
-            (255, 255, 255),
-            font=arial,
-        )
-        draw.text(
-            (1185, 685),
-            f"{duration[:23]}",
-            (255, 255, 255),
-            font=arial,
-        )
-        try:
-            os.remove(f"cache/thumb{videoid}.png")
-        except:
-            pass
-        background.save(f"cache/{videoid}.png")
-        return f"cache/{videoid}.png"
+        render_times.append(time.monotonic() - start)
+        return path
     except Exception as e:
-        print(e)
+        LOGGER(__name__).warning(f"Could not render thumbnail of {videoid} : {e}")
         return YOUTUBE_IMG_URL
+
+
+def _rendered(videoid, future):
+    rendering.pop(videoid, None)
+    if not future.cancelled():
+        future.exception()
+
+
+async def get_thumb(videoid):
+    if os.path.isfile(f"cache/{videoid}.png"):
+        return f"cache/{videoid}.png"
+    future = rendering.get(videoid)
+    if future is None:
+        future = asyncio.ensure_future(_get_thumb(videoid))
+        rendering[videoid] = future
+        future.add_done_callback(lambda f: _rendered(videoid, f))
+    return await asyncio.shield(future)
+
+
+def prerender(videoid):
+    """Render the now playing card of a queued track before it starts."""
+    if not re.fullmatch(r"[A-Za-z0-9_-]{11}", str(videoid)):
+        return
+    if os.path.isfile(f"cache/{videoid}.png") or videoid in rendering:
+        return
+    asyncio.ensure_future(get_thumb(videoid))
@@ -0,0 +1,170 @@
+import asyncio
+import glob
+import multiprocessing
+import os
+import random
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import yt_dlp
+
+import config
+from Clonify.logging import LOGGER
+
+# --------------------
+# Worker side
+# --------------------
+# every worker keeps its YoutubeDL instances (and the cookies they loaded)
+# alive between jobs, keyed by the options they were built with
+_instances = {}
+_cookiefile = None
+
+
+def _init_worker():
+    global _cookiefile
+    cookies = glob.glob(os.path.join(os.getcwd(), "cookies", "*.txt"))
+    if cookies:
+        _cookiefile = f"cookies/{os.path.basename(random.choice(cookies))}"
+
+
+def _opts(opts: dict) -> dict:
+    opts = dict(opts, quiet=True, no_warnings=True)
+    if _cookiefile:
+        opts.setdefault("cookiefile", _cookiefile)
+    return opts
+
+
+def _ydl(opts: dict) -> yt_dlp.YoutubeDL:
+    opts = _opts(opts)
+    key = repr(sorted(opts.items(), key=lambda x: x[0]))
+    ydl = _instances.get(key)
+    if ydl is None:
+        if len(_instances) >= 8:
+            _instances.pop(next(iter(_instances))).close()
+        ydl = _instances[key] = yt_dlp.YoutubeDL(opts)
+    return ydl
+
+
+def _extract(link):
+    ydl = _ydl({"skip_download": True})
+    return ydl.sanitize_info(ydl.extract_info(link, download=False))
+
+
+def _get_url(link, fmt):
+    info = _ydl({"format": fmt}).extract_info(link, download=False)
+    if info.get("url"):
+        return info["url"]
+    return info["requested_formats"][0]["url"]
+
+
+def _flat_playlist(link, limit):
+    ydl = _ydl({"extract_flat": "in_playlist", "ignoreerrors": True})
+    ydl.params["playlistend"] = limit
+    info = ydl.extract_info(link, download=False)
+    return [entry["id"] for entry in info.get("entries") or [] if entry]
+
+
+def _download(link, opts, reuse=True):
+    if not reuse:
+        # one-off output names, not worth keeping an instance around for
+        with yt_dlp.YoutubeDL(_opts(opts)) as ydl:
+            ydl.download([link])
+        return None
+    ydl = _ydl(opts)
+    info = ydl.extract_info(link, download=False)
+    filepath = os.path.join("downloads", f"{info['id']}.{info['ext']}")
+    if not os.path.exists(filepath):
+        ydl.download([link])
+    return filepath
+
+
+# --------------------
+# Bot side
+# --------------------
+_pool = None
+stats = {"pending": 0, "done": 0, "failed": 0, "timeouts": 0}
+latencies = deque(maxlen=200)
+
+
+def _executor() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        _pool = ProcessPoolExecutor(
+            max_workers=config.YTDL_WORKERS,
+            mp_context=multiprocessing.get_context("fork"),
+            initializer=_init_worker,
+        )
+    return _pool
+
+
+def start():
+    """Fork the workers while the bot is still single threaded.
+
+    Forking after pyrogram, motor and pytgcalls started their threads can
+    copy a lock some thread is holding into a worker that then hangs on it."""
+    _executor().submit(os.getpid).result()
+
+
+async def _submit(timeout, func, *args):
+    global _pool
+    stats["pending"] += 1
+    start = time.monotonic()
+    try:
+        try:
+            future = _executor().submit(func, *args)
+        except BrokenProcessPool:
+            LOGGER(__name__).warning("yt-dlp worker pool broke, starting a new one")
+            _pool = None
+            future = _executor().submit(func, *args)
+        try:
+            result = await asyncio.wait_for(asyncio.wrap_future(future), timeout)
+        except asyncio.TimeoutError:
+            stats["timeouts"] += 1
+            future.cancel()
+            raise
+        stats["done"] += 1
+        return result
+    except:
+        stats["failed"] += 1
+        raise
+    finally:
+        stats["pending"] -= 1
+        latencies.append(time.monotonic() - start)
+
+
+async def extract(link: str) -> dict:
+    return await _submit(config.YTDL_TIMEOUT, _extract, link)
+
+
+async def get_url(link: str, fmt: str) -> str:
+    return await _submit(config.YTDL_TIMEOUT, _get_url, link, fmt)
+
+
+async def flat_playlist(link: str, limit: int) -> list:
+    return await _submit(config.YTDL_TIMEOUT, _flat_playlist, link, int(limit))
+
+
+async def download(
+    link: str, opts: dict, reuse: bool = True, timeout=config.YTDL_DOWNLOAD_TIMEOUT
+):
+    return await _submit(timeout, _download, link, opts, reuse)
+
+
+def pool_stats() -> dict:
+    ordered = sorted(latencies)
+    avg = sum(ordered) / len(ordered) if ordered else 0
+    p95 = ordered[int(len(ordered) * 0.95) - 1] if ordered else 0
+    return dict(
+        stats,
+        workers=config.YTDL_WORKERS,
+        queued=max(stats["pending"] - config.YTDL_WORKERS, 0),
+        avg=round(avg, 2),
+        p95=round(p95, 2),
+    )
+
+
+def shutdown():
+    if _pool:
+        _pool.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,106 @@
+import asyncio
+import re
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Optional
+
+from youtubesearchpython.__future__ import VideosSearch
+
+import config
+from Clonify.logging import LOGGER
+from Clonify.utils.database.database import get_yt_metadata, save_yt_metadata
+
+VIDEO_ID = re.compile(r"(?:v=|youtu\.be/|shorts/|embed/|live/)([A-Za-z0-9_-]{11})")
+
+# key -> (expires_at, first VideosSearch result)
+metacache = OrderedDict()
+# key -> future of the search currently running for it
+inflight = {}
+# coalesced counts the callers that waited on another caller's lookup
+stats = {"hits": 0, "mongo_hits": 0, "misses": 0, "coalesced": 0}
+
+
+def meta_key(query: str) -> str:
+    match = VIDEO_ID.search(query)
+    if match:
+        return f"vid:{match.group(1)}"
+    return "q:" + " ".join(query.lower().split())
+
+
+def _remember(key, result, age=0):
+    metacache[key] = (time.time() + config.YT_META_TTL - age, result)
+    metacache.move_to_end(key)
+    while len(metacache) > config.YT_META_CACHE_SIZE:
+        metacache.popitem(last=False)
+
+
+def _cached(key):
+    item = metacache.get(key)
+    if not item:
+        return None
+    expires, result = item
+    if expires < time.time():
+        metacache.pop(key, None)
+        return None
+    metacache.move_to_end(key)
+    return result
+
+
+async def _lookup(key, query):
+    try:
+        meta = await get_yt_metadata(key)
+    except:
+        meta = None
+    if meta:
+        # mongo only drops expired documents once a minute
+        age = (datetime.utcnow() - meta["date"]).total_seconds()
+        if age < config.YT_META_TTL:
+            stats["mongo_hits"] += 1
+            _remember(key, meta["result"], age)
+            return meta["result"]
+    stats["misses"] += 1
+    search = VideosSearch(query, limit=1)
+    results = (await search.next())["result"]
+    if not results:
+        return None
+    result = results[0]
+    keys = {key, f"vid:{result['id']}"}
+    for k in keys:
+        _remember(k, result)
+    try:
+        await save_yt_metadata(list(keys), result)
+    except Exception as e:
+        LOGGER(__name__).warning(f"Could not store metadata for {key} : {e}")
+    return result
+
+
+def _settled(key, future):
+    inflight.pop(key, None)
+    if not future.cancelled():
+        future.exception()
+
+
+async def search_one(query: str) -> Optional[dict]:
+    """First VideosSearch result for a link, video id url or search text."""
+    if "&" in query and VIDEO_ID.search(query):
+        query = query.split("&")[0]
+    key = meta_key(query)
+    result = _cached(key)
+    if result:
+        stats["hits"] += 1
+        return result
+    future = inflight.get(key)
+    if future is None:
+        future = asyncio.ensure_future(_lookup(key, query))
+        inflight[key] = future
+        future.add_done_callback(lambda f: _settled(key, f))
+    else:
+        stats["coalesced"] += 1
+    return await asyncio.shield(future)
+
+
+def cache_stats() -> dict:
+    total = stats["hits"] + stats["mongo_hits"] + stats["misses"]
+    ratio = (stats["hits"] + stats["mongo_hits"]) / total * 100 if total else 0
+    return dict(stats, size=len(metacache), ratio=round(ratio, 1))
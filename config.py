@@ -99,6 +99,8 @@ SPOTIFY_CLIENT_SECRET = getenv("SPOTIFY_CLIENT_SECRET", "709e1a2969664491b582008
 
 # -----------------------------------------------------------------------------------
 PLAYLIST_FETCH_LIMIT = int(getenv("PLAYLIST_FETCH_LIMIT", 25))
+# playlist tracks looked up at the same time
+PLAYLIST_CONCURRENCY = int(getenv("PLAYLIST_CONCURRENCY", "5"))
 # ------------------------------------------------------------------------------------
 
 # ------------------------------------------------------------------------------------
@@ -115,11 +117,81 @@ TG_VIDEO_FILESIZE_LIMIT = int(getenv("TG_VIDEO_FILESIZE_LIMIT", "5242880000"))
 # ------------------------------------
 STRING1 = getenv("STRING_SESSION", "")
 STRING2 = getenv("STRING_SESSION2", None)
+# every STRING_SESSION<n> that is set becomes assistant number <n> in the pool
+MAX_ASSISTANTS = int(getenv("MAX_ASSISTANTS", "10"))
+STRING_SESSIONS = {
+    num: session
+    for num, session in [(1, STRING1)]
+    + [(i, getenv(f"STRING_SESSION{i}")) for i in range(2, MAX_ASSISTANTS + 1)]
+    if session
+}
+ASSISTANT_HEALTH_INTERVAL = int(getenv("ASSISTANT_HEALTH_INTERVAL", "30"))
+# how many upcoming queue entries get resolved while the current track plays
+PREFETCH_DEPTH = int(getenv("PREFETCH_DEPTH", "1"))
+# youtube search results kept in memory / in mongo (seconds)
+YT_META_CACHE_SIZE = int(getenv("YT_META_CACHE_SIZE", "512"))
+YT_META_TTL = int(getenv("YT_META_TTL", "86400"))
+# resolved stream urls are dropped this many seconds before they expire and
+# refreshed in the background once less than STREAM_URL_REFRESH is left
+STREAM_URL_MARGIN = int(getenv("STREAM_URL_MARGIN", "300"))
+STREAM_URL_REFRESH = int(getenv("STREAM_URL_REFRESH", "1800"))
+# yt-dlp worker processes and their per-job timeouts (seconds)
+YTDL_WORKERS = int(getenv("YTDL_WORKERS", "2"))
+YTDL_TIMEOUT = int(getenv("YTDL_TIMEOUT", "60"))
+YTDL_DOWNLOAD_TIMEOUT = int(getenv("YTDL_DOWNLOAD_TIMEOUT", "600"))
+# disk budget of the downloads/ media cache in MB
+MEDIA_CACHE_SIZE = int(getenv("MEDIA_CACHE_SIZE", "2048"))
+# how often (seconds) changes to the media cache index are written to disk
+MEDIA_INDEX_FLUSH_INTERVAL = int(getenv("MEDIA_INDEX_FLUSH_INTERVAL", "30"))
+# audio downloads start playing once this many bytes are on disk (0 waits for
+# the whole file), ffmpeg gives up on a stalled download after the timeout
+STREAM_START_BYTES = int(getenv("STREAM_START_BYTES", "393216"))
+STREAM_FOLLOW_TIMEOUT = int(getenv("STREAM_FOLLOW_TIMEOUT", "10"))
+# processes rendering now playing cards
+THUMB_WORKERS = int(getenv("THUMB_WORKERS", "1"))
+# progress bars of now playing cards are refreshed once per interval (seconds)
+# with at most PROGRESS_CONCURRENCY edits in flight
+PROGRESS_INTERVAL = int(getenv("PROGRESS_INTERVAL", "7"))
+PROGRESS_CONCURRENCY = int(getenv("PROGRESS_CONCURRENCY", "10"))
+# admin lists are kept this long (seconds) before being fetched again, member
+# updates in the chat drop them earlier
+ADMIN_CACHE_TTL = int(getenv("ADMIN_CACHE_TTL", "600"))
+# load the settings of all chats at boot, changed settings are written in
+# batches every SETTINGS_FLUSH_INTERVAL seconds
+SETTINGS_PRELOAD = getenv("SETTINGS_PRELOAD", "True").lower() in ["true", "1", "yes"]
+SETTINGS_FLUSH_INTERVAL = int(getenv("SETTINGS_FLUSH_INTERVAL", "5"))
+# how often (seconds) global on/off flags changed by another process are picked up
+FLAGS_POLL_INTERVAL = int(getenv("FLAGS_POLL_INTERVAL", "30"))
+# new served users and chats are written together every SERVED_FLUSH_INTERVAL
+# milliseconds, or as soon as SERVED_FLUSH_SIZE of them are waiting
+SERVED_FLUSH_INTERVAL = int(getenv("SERVED_FLUSH_INTERVAL", "500"))
+SERVED_FLUSH_SIZE = int(getenv("SERVED_FLUSH_SIZE", "100"))
+# documents read per query when going over all served chats or users, and
+# how long (seconds) their counts are reused
+DB_BATCH_SIZE = int(getenv("DB_BATCH_SIZE", "500"))
+COUNT_CACHE_TTL = int(getenv("COUNT_CACHE_TTL", "60"))
+# clone bots logging in at the same time while the fleet boots
+CLONE_BOOT_CONCURRENCY = int(getenv("CLONE_BOOT_CONCURRENCY", "5"))
+# clones are checked every CLONE_WATCH_INTERVAL seconds, one that went down is
+# restarted after CLONE_RESTART_DELAY seconds, doubling on every failed try
+CLONE_WATCH_INTERVAL = int(getenv("CLONE_WATCH_INTERVAL", "30"))
+CLONE_RESTART_DELAY = int(getenv("CLONE_RESTART_DELAY", "5"))
+# clones that got no update for CLONE_IDLE_TIMEOUT seconds are stopped until the
+# next one arrives, 0 keeps every clone running
+CLONE_IDLE_TIMEOUT = int(getenv("CLONE_IDLE_TIMEOUT", "86400"))
+# a clone's last activity is written to its document at most this often, in
+# seconds, so a restart does not wake clones that were idle before it
+CLONE_ACTIVE_SAVE_INTERVAL = int(getenv("CLONE_ACTIVE_SAVE_INTERVAL", "600"))
+# bot api connections kept open, shared by clone provisioning and the polls of
+# hibernated clones, attempts per call and how many clones get their commands
+# and description at the same time
+BOTAPI_POOL_SIZE = int(getenv("BOTAPI_POOL_SIZE", "50"))
+BOTAPI_RETRIES = int(getenv("BOTAPI_RETRIES", "3"))
+PROVISION_CONCURRENCY = int(getenv("PROVISION_CONCURRENCY", "10"))
 BANNED_USERS = filters.user()
 adminlist = {}
 lyrical = {}
 votemode = {}
-autoclean = []
 confirmer = {}
 
 # ------------------------------------